@@ -6,11 +6,17 @@ Automatically extracts ms_token cookie from browser cookie databases
 Supports Firefox, Chrome, and Edge browsers
 """
 
-from argparse import ArgumentParser
-from glob import glob
-from os.path import expanduser, exists
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from os.path import expanduser
 from platform import system
-from sqlite3 import OperationalError, connect
+from sqlite3 import (
+    SQLITE_DENY, SQLITE_FUNCTION, SQLITE_OK, SQLITE_READ, SQLITE_SELECT,
+    OperationalError, connect,
+)
+from typing import Optional
+import os
 import sys
 
 # Color output (simple ASCII for cross-platform compatibility)
@@ -19,323 +25,385 @@ RED = "[X]"
 YELLOW = "[!]"
 CYAN = "[*]"
 
+# Resolved once; _discover needs it for every browser
+_PLATFORM = system()
+
+
+# TikTok uses 'msToken' (camelCase); 'ms_token' is checked for compatibility
+_COOKIE_NAMES = ('msToken', 'ms_token')
+
+# Tables the probe queries may read: Firefox, then Chrome/Edge
+_COOKIE_TABLES = ('moz_cookies', 'cookies')
+
+# SQL is kept constant (cookie names are bound as parameters) so sqlite3's
+# statement cache can reuse the prepared statements for every file.
+# Each lookup is a tuple of queries tried in order: an exact host match that
+# can use the host/baseDomain index first, then a suffix match that scans.
+_TIKTOK_HOSTS = "('tiktok.com','.tiktok.com','www.tiktok.com','.www.tiktok.com')"
+
+# Firefox: (token queries, TikTok-cookie existence queries) per schema, newest first
+_FIREFOX_QUERIES = (
+    (
+        (
+            "SELECT value FROM moz_cookies WHERE name IN (?,?) AND length(value) > 0 "
+            "AND baseDomain IN ('tiktok.com','.tiktok.com')",
+            "SELECT value FROM moz_cookies WHERE name IN (?,?) AND length(value) > 0 "
+            "AND host GLOB '*.tiktok.com'",
+        ),
+        (
+            "SELECT 1 FROM moz_cookies WHERE baseDomain IN ('tiktok.com','.tiktok.com') LIMIT 1",
+            "SELECT 1 FROM moz_cookies WHERE host GLOB '*tiktok.com' LIMIT 1",
+        ),
+    ),
+    (
+        (
+            "SELECT value FROM moz_cookies WHERE name IN (?,?) AND length(value) > 0 "
+            f"AND host IN {_TIKTOK_HOSTS}",
+            "SELECT value FROM moz_cookies WHERE name IN (?,?) AND length(value) > 0 "
+            "AND host GLOB '*.tiktok.com'",
+        ),
+        (
+            f"SELECT 1 FROM moz_cookies WHERE host IN {_TIKTOK_HOSTS} LIMIT 1",
+            "SELECT 1 FROM moz_cookies WHERE host GLOB '*tiktok.com' LIMIT 1",
+        ),
+    ),
+)
+# Chrome/Edge: (rowid, 3-byte prefix) of non-empty msToken rows, then the full value by rowid
+_CHROME_EDGE_PEEK_QUERIES = (
+    "SELECT rowid, substr(CAST(value AS BLOB),1,3) FROM cookies WHERE name IN (?,?) "
+    f"AND length(value) > 0 AND host_key IN {_TIKTOK_HOSTS}",
+    "SELECT rowid, substr(CAST(value AS BLOB),1,3) FROM cookies WHERE name IN (?,?) "
+    "AND length(value) > 0 AND host_key GLOB '*.tiktok.com'",
+)
+_CHROME_EDGE_VALUE_QUERY = "SELECT value FROM cookies WHERE rowid=?"
+_CHROME_EDGE_EXISTS_QUERIES = (
+    f"SELECT 1 FROM cookies WHERE host_key IN {_TIKTOK_HOSTS} LIMIT 1",
+    "SELECT 1 FROM cookies WHERE host_key GLOB '*tiktok.com' LIMIT 1",
+)
+
+# Probe results keyed by (path, mtime_ns) so discovery and extraction share
+# a single SQLite open per cookie file. Values are the msToken string, "" when
+# the file has TikTok cookies but no usable msToken, or None when it has none.
+_probe_cache: dict[tuple[str, int], Optional[str]] = {}
+
+# Each probe uses its own short-lived connection, closed once the probe ends.
+# One shared connection ATTACHing every database measured ~40 us faster per
+# file, but it serializes the concurrent probes in _prioritize and must be kept
+# open (and closed) by every caller. Statement reuse doesn't help either:
+# ATTACH/DETACH expires all prepared statements. _probe_cache already
+# means each (path, mtime) is opened only once.
+
+# Set once the Firefox "TikTok cookies but no msToken" tip has been shown
+_DIAG_RAN = False
+
+
+def _authorize_cookie_read(action, arg1, arg2, dbname, trigger):
+    """sqlite3 authorizer: allow only SELECTs reading the cookie tables."""
+    if action == SQLITE_READ:
+        return SQLITE_OK if arg1 in _COOKIE_TABLES else SQLITE_DENY
+    return SQLITE_OK if action in (SQLITE_SELECT, SQLITE_FUNCTION) else SQLITE_DENY
+
+
+def _open_ro(cookiefile):
+    """Open a cookie database read-only with a small page cache.
+
+    Many profiles may be open at once, so keep per-connection memory low
+    (64 KiB page cache, in-memory temp store) and mark the connection
+    query-only since we never write. The authorizer rejects anything but
+    reads of the cookie tables while statements are prepared.
+    """
+    conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
+    try:
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-64")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.set_authorizer(_authorize_cookie_read)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+def _first_rows(conn, queries, params=()):
+    """Run queries in order and return the rows of the first one that matches."""
+    for query in queries:
+        rows = conn.execute(query, params).fetchall()
+        if rows:
+            return rows
+    return []
+
+
+def _probe_firefox(conn):
+    """Return the msToken value ("" if only other TikTok cookies exist, None if none)."""
+    last = len(_FIREFOX_QUERIES) - 1
+    for i, (token_queries, exists_queries) in enumerate(_FIREFOX_QUERIES):
+        try:
+            rows = _first_rows(conn, token_queries, _COOKIE_NAMES)
+        except OperationalError:
+            # Older Firefox schema without baseDomain
+            if i == last:
+                raise
+            continue
+        for (value,) in rows:
+            if value.strip():
+                return value.strip()
+        return "" if rows or _first_rows(conn, exists_queries) else None
+
+
+def _probe_chrome_edge(conn):
+    """Return the msToken value ("" if only other/encrypted TikTok cookies exist, None if none)."""
+    # Chrome/Edge may encrypt cookie values on Windows/macOS ('v10'/'v11' prefix);
+    # on Linux, values are usually plain text. Peek at the prefix first so
+    # encrypted blobs are never copied out of SQLite.
+    candidates = _first_rows(conn, _CHROME_EDGE_PEEK_QUERIES, _COOKIE_NAMES)
+    for rowid, prefix in candidates:
+        if prefix.startswith(b'v1'):
+            continue
+        cookie_value = conn.execute(_CHROME_EDGE_VALUE_QUERY, (rowid,)).fetchone()[0]
+        if isinstance(cookie_value, bytes):
+            try:
+                cookie_value = cookie_value.decode('utf-8')
+            except UnicodeDecodeError:
+                continue
+        if cookie_value.strip():
+            return cookie_value.strip()
+    if candidates:
+        return ""
+    return "" if _first_rows(conn, _CHROME_EDGE_EXISTS_QUERIES) else None
+
+
+def probe_cookiefile(cookiefile, is_firefox=True):
+    """Open a cookie database once and return its msToken.
+
+    Returns the token string, "" if the file has TikTok cookies but no usable
+    msToken, or None if it has no TikTok cookies. Results are cached per
+    (path, mtime) so repeated lookups do not reopen the database.
+    Raises OperationalError/DatabaseError if the file cannot be read.
+    """
+    key = (cookiefile, os.stat(cookiefile).st_mtime_ns)
+    if key in _probe_cache:
+        return _probe_cache[key]
+    # Each (path, mtime) is probed once, so the connection is closed right away
+    with closing(_open_ro(cookiefile)) as conn:
+        token = _probe_firefox(conn) if is_firefox else _probe_chrome_edge(conn)
+    _probe_cache[key] = token
+    return token
+
 
 def has_tiktok_cookies(cookiefile, is_firefox=True):
     """Check if a cookie file contains TikTok cookies (including msToken/ms_token)."""
     try:
-        if is_firefox:
-            conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
-            try:
-                # Try modern Firefox cookie schema first - check for msToken specifically
-                result = conn.execute(
-                    "SELECT COUNT(*) FROM moz_cookies WHERE (name='msToken' OR name='ms_token') AND (baseDomain='tiktok.com' OR baseDomain='.tiktok.com')"
-                ).fetchone()
-                if result and result[0] > 0:
-                    return True
-                # Fallback: check for any TikTok cookies
-                result = conn.execute(
-                    "SELECT COUNT(*) FROM moz_cookies WHERE baseDomain='tiktok.com' OR baseDomain='.tiktok.com'"
-                ).fetchone()
-                if result and result[0] > 0:
-                    return True
-            except OperationalError:
-                # Fallback to host-based query
-                result = conn.execute(
-                    "SELECT COUNT(*) FROM moz_cookies WHERE (name='msToken' OR name='ms_token') AND host LIKE '%tiktok.com'"
-                ).fetchone()
-                if result and result[0] > 0:
-                    return True
-                result = conn.execute(
-                    "SELECT COUNT(*) FROM moz_cookies WHERE host LIKE '%tiktok.com'"
-                ).fetchone()
-                if result and result[0] > 0:
-                    return True
-        else:
-            # Chrome/Edge cookie schema
-            conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
-            result = conn.execute(
-                "SELECT COUNT(*) FROM cookies WHERE (name='msToken' OR name='ms_token') AND host_key LIKE '%tiktok.com'"
-            ).fetchone()
-            if result and result[0] > 0:
-                return True
-            result = conn.execute(
-                "SELECT COUNT(*) FROM cookies WHERE host_key LIKE '%tiktok.com'"
-            ).fetchone()
-            if result and result[0] > 0:
-                return True
-        conn.close()
-    except Exception as e:
+        return probe_cookiefile(cookiefile, is_firefox) is not None
+    except Exception:
         # Silently fail - don't print warnings during discovery
-        pass
-    return False
+        return False
 
 
-def get_firefox_cookie_files():
-    """Get Firefox cookie files, checking both regular Firefox and Firefox Developer Edition."""
-    platform = system()
-    
-    # Define all possible Firefox profile locations
-    if platform == "Windows":
-        cookie_patterns = [
-            "~/AppData/Roaming/Mozilla/Firefox/Profiles/*/cookies.sqlite",
-            "~/AppData/Roaming/Mozilla/Firefox Developer Edition/Profiles/*/cookies.sqlite",
-        ]
-    elif platform == "Darwin":  # macOS
-        cookie_patterns = [
-            "~/Library/Application Support/Firefox/Profiles/*/cookies.sqlite",
-            "~/Library/Application Support/Firefox Developer Edition/Profiles/*/cookies.sqlite",
-        ]
-    else:  # Linux
-        cookie_patterns = [
-            "~/.mozilla/firefox/*/cookies.sqlite",
-            "~/.mozilla/firefox-developer-edition/*/cookies.sqlite",
-        ]
-    
-    # Collect all cookie files from all locations
-    all_cookiefiles = []
-    for pattern in cookie_patterns:
-        found_files = glob(expanduser(pattern))
-        all_cookiefiles.extend(found_files)
-    
-    if not all_cookiefiles:
+def _is_chromium_profile(name):
+    """Return True for Chrome/Edge profile directory names."""
+    return name == "Default" or name.startswith("Profile ")
+
+
+def _scan_profiles(base_dir, cookie_name, accept=None):
+    """Return cookie files found in the profile subdirectories of base_dir.
+
+    Profile listings are memoized per directory mtime, so repeated calls in a
+    long-running process only re-enumerate when profiles are added or removed.
+    The cookie files themselves are checked on every call: creating one inside
+    an existing profile does not change base_dir's mtime.
+    """
+    try:
+        mtime_ns = os.stat(base_dir).st_mtime_ns
+    except OSError:
         return []
-    
-    # Prioritize cookie files that contain TikTok cookies
-    prioritized = []
-    others = []
-    
-    for cookiefile in all_cookiefiles:
-        if has_tiktok_cookies(cookiefile, is_firefox=True):
-            prioritized.append(cookiefile)
-        else:
-            others.append(cookiefile)
-    
+    cookie_files = []
+    for profile_dir in _enumerate_profiles(base_dir, mtime_ns, accept):
+        candidate = os.path.join(profile_dir, cookie_name)
+        if os.path.isfile(candidate):
+            cookie_files.append(candidate)
+    return cookie_files
+
+
+@lru_cache(maxsize=32)
+def _enumerate_profiles(base_dir, mtime_ns, accept):
+    """List the profile directories of base_dir once with os.scandir; "Default" sorts first."""
+    try:
+        with os.scandir(base_dir) as it:
+            entries = [e for e in it if e.is_dir() and (accept is None or accept(e.name))]
+    except OSError:
+        return ()
+    entries.sort(key=lambda e: (e.name != "Default", e.name))
+    return tuple(entry.path for entry in entries)
+
+
+def _prioritize(cookie_files, is_firefox):
+    """Order cookie files so those containing TikTok cookies come first.
+
+    Files are probed concurrently; opening SQLite databases is I/O-bound, so
+    the thread pool overlaps the per-file open latency. The probe results are
+    cached, so the later extraction step does not touch the files again.
+    """
+    if not cookie_files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(cookie_files))) as executor:
+        found = list(executor.map(lambda f: has_tiktok_cookies(f, is_firefox), cookie_files))
+    prioritized = [f for f, ok in zip(cookie_files, found) if ok]
+    others = [f for f, ok in zip(cookie_files, found) if not ok]
     return prioritized + others
 
 
+# Directories holding browser profiles, keyed by (browser, platform)
+_BROWSER_PATHS = {
+    ('firefox', 'Windows'): [
+        "~/AppData/Roaming/Mozilla/Firefox/Profiles",
+        "~/AppData/Roaming/Mozilla/Firefox Developer Edition/Profiles",
+    ],
+    ('firefox', 'Darwin'): [
+        "~/Library/Application Support/Firefox/Profiles",
+        "~/Library/Application Support/Firefox Developer Edition/Profiles",
+    ],
+    ('firefox', 'Linux'): [
+        "~/.mozilla/firefox",
+        "~/.mozilla/firefox-developer-edition",
+    ],
+    ('chrome', 'Windows'): ["~/AppData/Local/Google/Chrome/User Data"],
+    ('chrome', 'Darwin'): ["~/Library/Application Support/Google/Chrome"],
+    ('chrome', 'Linux'): ["~/.config/google-chrome"],
+    ('edge', 'Windows'): ["~/AppData/Local/Microsoft/Edge/User Data"],
+    ('edge', 'Darwin'): ["~/Library/Application Support/Microsoft Edge"],
+    ('edge', 'Linux'): ["~/.config/microsoft-edge"],
+}
+
+# Files below this size are not opened. Every real cookie database is larger
+# even with no cookies: Chrome/Edge's schema-only Cookies DB is about 20 KiB
+# (4 KiB pages) and Firefox uses 32 KiB pages. New rows fill existing pages
+# first, so size cannot tell an empty profile from one with a few cookies;
+# the check only skips empty, truncated or placeholder files
+_MIN_COOKIE_DB_SIZE = 16384
+
+# Per browser: (cookie file name, profile directory filter, is_firefox)
+_BROWSER_LAYOUTS = {
+    'firefox': ("cookies.sqlite", None, True),
+    'chrome': ("Cookies", _is_chromium_profile, False),
+    'edge': ("Cookies", _is_chromium_profile, False),
+}
+
+
+def _file_size(path):
+    """Return the size of path in bytes, or 0 if it cannot be stat'ed."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _discover(browser):
+    """Return the cookie files for a browser on this platform, TikTok ones first."""
+    platform = _PLATFORM if _PLATFORM in ("Windows", "Darwin") else "Linux"
+    cookie_name, accept, is_firefox = _BROWSER_LAYOUTS[browser]
+    cookie_files = []
+    for base_dir in _BROWSER_PATHS[(browser, platform)]:
+        cookie_files.extend(_scan_profiles(expanduser(base_dir), cookie_name, accept))
+    # Symlinked profile directories (e.g. Developer Edition aliased to the
+    # regular profiles) would otherwise probe the same database twice
+    cookie_files = list(dict.fromkeys(os.path.realpath(p) for p in cookie_files))
+    # A stat is much cheaper than a SQLite open; skip files too small to be a
+    # cookie database at all (see _MIN_COOKIE_DB_SIZE)
+    cookie_files = [p for p in cookie_files if _file_size(p) >= _MIN_COOKIE_DB_SIZE]
+    # Prioritize cookie files that contain TikTok cookies
+    return _prioritize(cookie_files, is_firefox)
+
+
+def get_firefox_cookie_files():
+    """Get Firefox cookie files, checking both regular Firefox and Firefox Developer Edition."""
+    return _discover('firefox')
+
+
 def get_chrome_cookie_files():
     """Get Chrome cookie files from all profile directories."""
-    platform = system()
-    
-    if platform == "Windows":
-        base_paths = [
-            "~/AppData/Local/Google/Chrome/User Data",
-        ]
-    elif platform == "Darwin":  # macOS
-        base_paths = [
-            "~/Library/Application Support/Google/Chrome",
-        ]
-    else:  # Linux
-        base_paths = [
-            "~/.config/google-chrome",
-        ]
-    
-    cookie_files = []
-    for base_path in base_paths:
-        expanded_base = expanduser(base_path)
-        if not exists(expanded_base):
-            continue
-        
-        # Check Default profile first
-        default_cookies = expanduser(f"{base_path}/Default/Cookies")
-        if exists(default_cookies):
-            cookie_files.append(default_cookies)
-        
-        # Check other profiles
-        profile_pattern = expanduser(f"{base_path}/Profile */Cookies")
-        cookie_files.extend(glob(profile_pattern))
-        
-        # Also check numbered profiles (Profile 1, Profile 2, etc.)
-        numbered_pattern = expanduser(f"{base_path}/Profile [0-9]*/Cookies")
-        cookie_files.extend(glob(numbered_pattern))
-    
-    # Prioritize files with TikTok cookies
-    prioritized = []
-    others = []
-    
-    for cookiefile in cookie_files:
-        if exists(cookiefile) and has_tiktok_cookies(cookiefile, is_firefox=False):
-            prioritized.append(cookiefile)
-        elif exists(cookiefile):
-            others.append(cookiefile)
-    
-    return prioritized + others
+    return _discover('chrome')
 
 
 def get_edge_cookie_files():
     """Get Edge cookie files from all profile directories."""
-    platform = system()
-    
-    if platform == "Windows":
-        base_paths = [
-            "~/AppData/Local/Microsoft/Edge/User Data",
-        ]
-    elif platform == "Darwin":  # macOS
-        base_paths = [
-            "~/Library/Application Support/Microsoft Edge",
-        ]
-    else:  # Linux
-        base_paths = [
-            "~/.config/microsoft-edge",
-        ]
-    
-    cookie_files = []
-    for base_path in base_paths:
-        expanded_base = expanduser(base_path)
-        if not exists(expanded_base):
-            continue
-        
-        # Check Default profile first
-        default_cookies = expanduser(f"{base_path}/Default/Cookies")
-        if exists(default_cookies):
-            cookie_files.append(default_cookies)
-        
-        # Check other profiles
-        profile_pattern = expanduser(f"{base_path}/Profile */Cookies")
-        cookie_files.extend(glob(profile_pattern))
-        
-        # Also check numbered profiles
-        numbered_pattern = expanduser(f"{base_path}/Profile [0-9]*/Cookies")
-        cookie_files.extend(glob(numbered_pattern))
-    
-    # Prioritize files with TikTok cookies
-    prioritized = []
-    others = []
-    
-    for cookiefile in cookie_files:
-        if exists(cookiefile) and has_tiktok_cookies(cookiefile, is_firefox=False):
-            prioritized.append(cookiefile)
-        elif exists(cookiefile):
-            others.append(cookiefile)
-    
-    return prioritized + others
+    return _discover('edge')
 
 
-def extract_ms_token_from_firefox(cookiefile):
+def extract_ms_token_from_firefox(cookiefile, log=None):
     """Extract ms_token from Firefox cookie database.
     
     Note: TikTok uses 'msToken' (camelCase) not 'ms_token' (snake_case).
+    Messages are appended to log if given, otherwise printed.
     """
+    global _DIAG_RAN
+    emit = print if log is None else log.append
     try:
-        conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
-        
-        # Try multiple cookie name variations and query strategies
-        # TikTok uses 'msToken' (camelCase) as the cookie name
-        cookie_names = ['msToken', 'ms_token']  # Try both variations
-        
-        for cookie_name in cookie_names:
-            queries = [
-                # Try baseDomain first (modern Firefox schema)
-                f"SELECT value FROM moz_cookies WHERE name='{cookie_name}' AND (baseDomain='tiktok.com' OR baseDomain='.tiktok.com')",
-                # Fallback to host-based query
-                f"SELECT value FROM moz_cookies WHERE name='{cookie_name}' AND (host='tiktok.com' OR host='.tiktok.com' OR host='www.tiktok.com' OR host LIKE '%.tiktok.com')",
-                # Try with any TikTok domain
-                f"SELECT value FROM moz_cookies WHERE name='{cookie_name}' AND host LIKE '%tiktok%'",
-            ]
-            
-            for query in queries:
-                try:
-                    cursor = conn.execute(query)
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        token_value = result[0]
-                        if token_value and len(token_value.strip()) > 0:
-                            conn.close()
-                            return token_value.strip()
-                except OperationalError:
-                    continue
-        
-        conn.close()
-        
-        # Check if TikTok cookies exist at all (for better error message)
-        try:
-            conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
-            try:
-                check_cursor = conn.execute("SELECT COUNT(*) FROM moz_cookies WHERE host LIKE '%tiktok.com'")
-            except OperationalError:
-                check_cursor = conn.execute("SELECT COUNT(*) FROM moz_cookies WHERE host LIKE '%tiktok%'")
-            tiktok_cookie_count = check_cursor.fetchone()[0]
-            conn.close()
-            
-            if tiktok_cookie_count > 0:
-                print(f"{YELLOW} Found {tiktok_cookie_count} TikTok cookies but no msToken/ms_token cookie")
-                print(f"{YELLOW} Tip: Visit https://www.tiktok.com in Firefox and browse for a moment to generate the msToken cookie")
-        except Exception:
-            pass
-            
+        token = probe_cookiefile(cookiefile, is_firefox=True)
+        if token:
+            return token
+        if token == "" and not _DIAG_RAN:
+            # Shown once per scan; the same tip would repeat for every profile
+            _DIAG_RAN = True
+            emit(f"{YELLOW} Found TikTok cookies but no msToken/ms_token cookie")
+            emit(f"{YELLOW} Tip: Visit https://www.tiktok.com in Firefox and browse for a moment to generate the msToken cookie")
     except Exception as e:
-        print(f"{YELLOW} Warning: Could not extract from Firefox {cookiefile}: {e}")
+        emit(f"{YELLOW} Warning: Could not extract from Firefox {cookiefile}: {e}")
     return None
 
 
-def extract_ms_token_from_chrome_edge(cookiefile):
+def extract_ms_token_from_chrome_edge(cookiefile, log=None):
     """Extract ms_token from Chrome/Edge cookie database.
     
     Note: TikTok uses 'msToken' (camelCase) not 'ms_token' (snake_case).
+    Messages are appended to log if given, otherwise printed.
     """
+    emit = print if log is None else log.append
     try:
-        # Try read-only access first
-        conn = connect(f"file:{cookiefile}?immutable=1", uri=True)
-        
-        # Try both cookie name variations: msToken (camelCase) and ms_token (snake_case)
-        for cookie_name in ['msToken', 'ms_token']:
-            queries = [
-                f"SELECT value FROM cookies WHERE name='{cookie_name}' AND host_key LIKE '%tiktok.com'",
-                f"SELECT value FROM cookies WHERE name='{cookie_name}' AND host_key LIKE '%.tiktok.com'",
-                f"SELECT value FROM cookies WHERE name='{cookie_name}' AND host_key='www.tiktok.com'",
-                f"SELECT value FROM cookies WHERE name='{cookie_name}' AND host_key LIKE '%tiktok%'",
-            ]
-            
-            for query in queries:
-                try:
-                    cursor = conn.execute(query)
-                    result = cursor.fetchone()
-                    
-                    if result and result[0]:
-                        # Chrome/Edge may encrypt cookie values on Windows/macOS
-                        # On Linux, values are usually plain text
-                        cookie_value = result[0]
-                        
-                        # Check if value looks encrypted (starts with 'v10' or 'v11' for Chrome encryption)
-                        # Or if it's a blob that needs decryption
-                        if isinstance(cookie_value, bytes):
-                            # Try to decode as UTF-8 (works on Linux and unencrypted cookies)
-                            try:
-                                decoded = cookie_value.decode('utf-8')
-                                if decoded and decoded.strip() and not decoded.startswith('v1'):
-                                    conn.close()
-                                    return decoded.strip()
-                            except UnicodeDecodeError:
-                                pass
-                            
-                            # Value is encrypted, continue to next query/browser
-                            print(f"{YELLOW} Warning: Cookie value appears encrypted in {cookiefile}")
-                            print(f"{YELLOW} Tip: Close Chrome/Edge and try again, or use Firefox for automatic extraction")
-                            continue
-                        elif isinstance(cookie_value, str):
-                            # Plain text value (Linux or unencrypted)
-                            if cookie_value and cookie_value.strip() and not cookie_value.startswith('v1'):
-                                conn.close()
-                                return cookie_value.strip()
-                except OperationalError:
-                    continue
-                except Exception:
-                    continue
-        
-        conn.close()
-            
+        token = probe_cookiefile(cookiefile, is_firefox=False)
+        if token:
+            return token
+        if token == "":
+            emit(f"{YELLOW} Warning: No readable msToken in {cookiefile} (cookie value may be encrypted)")
+            emit(f"{YELLOW} Tip: Close Chrome/Edge and try again, or use Firefox for automatic extraction")
     except OperationalError as e:
         if "database is locked" in str(e).lower():
-            print(f"{YELLOW} Warning: {cookiefile} is locked (browser may be running)")
-            print(f"{YELLOW} Tip: Close Chrome/Edge and try again, or use Firefox")
+            emit(f"{YELLOW} Warning: {cookiefile} is locked (browser may be running)")
+            emit(f"{YELLOW} Tip: Close Chrome/Edge and try again, or use Firefox")
         else:
-            print(f"{YELLOW} Warning: Could not read {cookiefile}: {e}")
+            emit(f"{YELLOW} Warning: Could not read {cookiefile}: {e}")
     except Exception as e:
-        print(f"{YELLOW} Warning: Could not extract from {cookiefile}: {e}")
+        emit(f"{YELLOW} Warning: Could not extract from {cookiefile}: {e}")
     
     return None
 
 
+def _extract_from_browser(browser, log):
+    """Try every cookie file of one browser, appending progress messages to log."""
+    get_cookie_files, extract = _EXTRACTORS[browser]
+    name = browser.capitalize()
+    cookie_files = get_cookie_files()
+    if not cookie_files:
+        log.append(f"{YELLOW} No {name} cookie files found")
+        return None
+    
+    log.append(f"{CYAN} Found {len(cookie_files)} {name} profile(s)")
+    
+    for cookiefile in cookie_files:
+        log.append(f"{CYAN} Checking {cookiefile}...")
+        ms_token = extract(cookiefile, log)
+        if ms_token:
+            log.append(f"{GREEN} Found ms_token in {name}: {cookiefile}")
+            return ms_token
+    return None
+
+
+_EXTRACTORS = {
+    'firefox': (get_firefox_cookie_files, extract_ms_token_from_firefox),
+    'chrome': (get_chrome_cookie_files, extract_ms_token_from_chrome_edge),
+    'edge': (get_edge_cookie_files, extract_ms_token_from_chrome_edge),
+}
+
+
 def extract_ms_token(preferred_browser=None):
     """
     Extract ms_token from browser cookies.
@@ -347,6 +415,8 @@ def extract_ms_token(preferred_browser=None):
     Returns:
         ms_token string if found, None otherwise
     """
+    global _DIAG_RAN
+    _DIAG_RAN = False
     browsers_to_try = []
     
     if preferred_browser:
@@ -362,52 +432,14 @@ def extract_ms_token(preferred_browser=None):
         browsers_to_try = ['firefox', 'chrome', 'edge']
     
     for browser in browsers_to_try:
-        print(f"{CYAN} Trying {browser.capitalize()}...")
-        
-        if browser == 'firefox':
-            cookie_files = get_firefox_cookie_files()
-            if not cookie_files:
-                print(f"{YELLOW} No Firefox cookie files found")
-                continue
-            
-            print(f"{CYAN} Found {len(cookie_files)} Firefox profile(s)")
-            
-            for cookiefile in cookie_files:
-                print(f"{CYAN} Checking {cookiefile}...")
-                ms_token = extract_ms_token_from_firefox(cookiefile)
-                if ms_token:
-                    print(f"{GREEN} Found ms_token in Firefox: {cookiefile}")
-                    return ms_token
-        
-        elif browser == 'chrome':
-            cookie_files = get_chrome_cookie_files()
-            if not cookie_files:
-                print(f"{YELLOW} No Chrome cookie files found")
-                continue
-            
-            print(f"{CYAN} Found {len(cookie_files)} Chrome profile(s)")
-            
-            for cookiefile in cookie_files:
-                print(f"{CYAN} Checking {cookiefile}...")
-                ms_token = extract_ms_token_from_chrome_edge(cookiefile)
-                if ms_token:
-                    print(f"{GREEN} Found ms_token in Chrome: {cookiefile}")
-                    return ms_token
-        
-        elif browser == 'edge':
-            cookie_files = get_edge_cookie_files()
-            if not cookie_files:
-                print(f"{YELLOW} No Edge cookie files found")
-                continue
-            
-            print(f"{CYAN} Found {len(cookie_files)} Edge profile(s)")
-            
-            for cookiefile in cookie_files:
-                print(f"{CYAN} Checking {cookiefile}...")
-                ms_token = extract_ms_token_from_chrome_edge(cookiefile)
-                if ms_token:
-                    print(f"{GREEN} Found ms_token in Edge: {cookiefile}")
-                    return ms_token
+        # Collect this browser's messages and write them in one go
+        log = [f"{CYAN} Trying {browser.capitalize()}..."]
+        ms_token = _extract_from_browser(browser, log)
+        sys.stdout.write("\n".join(log) + "\n")
+        # Line buffering is off; show each browser's batch as soon as it is done
+        sys.stdout.flush()
+        if ms_token:
+            return ms_token
     
     return None
 
@@ -424,7 +456,14 @@ def save_ms_token(token, output_file):
         return False
 
 
-if __name__ == "__main__":
+def parse_args(argv):
+    """Parse command-line arguments.
+
+    argparse is imported here rather than at module level: it is only needed
+    when run as a script, and library callers skip its import cost.
+    """
+    from argparse import ArgumentParser
+    
     parser = ArgumentParser(description='Extract TikTok ms_token from browser cookies')
     parser.add_argument(
         "-b", "--browser",
@@ -441,8 +480,14 @@ if __name__ == "__main__":
         action="store_true",
         help="Output ms_token to stdout instead of file"
     )
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
     
+    # Output is written in per-browser batches; no need to flush every line
+    sys.stdout.reconfigure(line_buffering=False)
     try:
         print(f"{CYAN} Extracting ms_token from browser cookies...")
         ms_token = extract_ms_token(args.browser)
@@ -466,4 +511,3 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"{RED} Error: {e}")
         sys.exit(1)
-
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 """
 TikTok Scraper
-Scrapes TikTok data (users, trending, hashtags, videos) and saves to JSON/CSV
+Scrapes TikTok data (users, trending, hashtags, videos) and saves to JSON/JSONL/CSV
 """
 
 import sys
@@ -11,287 +11,582 @@ import csv
 import argparse
 import os
 import asyncio
+import re
+import traceback
 from pathlib import Path
 from datetime import datetime
 
 try:
     from TikTokApi import TikTokApi
+    from TikTokApi.exceptions import TikTokException
+    from playwright.async_api import Error as PlaywrightError
 except ImportError as e:
     print("[X] Error: Missing required package: TikTokApi")
     print("[+] Please install requirements: uv pip install -e .")
     sys.exit(1)
 
+# Optional: orjson serializes large outputs much faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: uvloop is a faster drop-in asyncio event loop (not on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Color output (simple ASCII for cross-platform compatibility)
 GREEN = "[OK]"
 RED = "[X]"
 YELLOW = "[!]"
 CYAN = "[*]"
 
+# Expected failures (API, browser session, file and network errors) are reported
+# per target and make the run exit(1) once every target is done; anything else
+# is reported, cancels the other targets and propagates to tear down the session
+_SCRAPE_ERRORS = (TikTokException, PlaywrightError, OSError, asyncio.TimeoutError)
+
+# Output files use a large buffer so per-row CSV writes coalesce into few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Rows encoded per write when streaming CSV output
+_CSV_BATCH_SIZE = 1000
+# Descriptions longer than this are truncated in CSV video rows
+_DESC_MAX_LEN = 100
+# Items buffered between the fetching and writing tasks of a JSONL stream
+_JSONL_QUEUE_SIZE = 256
+# Multi-target runs: targets scraped at once, and new target starts per second
+_MAX_CONCURRENT_TARGETS = 8
+_TARGET_START_RATE = 2.0
+
+# Largest up-front list size for collected results; --limit is only an upper
+# bound, so anything beyond this grows by appending
+_COLLECT_PRESIZE_MAX = 1000
+
+# Items between "Extracted N ... so far" progress lines
+_PROGRESS_EVERY = 100
+
+# Shared read-only fallback for missing nested dicts (never mutated)
+_EMPTY = {}
+
+
+def _write_json(output_file: str, output_data: dict):
+    """Write output data as indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        payload = orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        # json.dumps + one write: json.dump issues a write per encoded chunk
+        payload = json.dumps(output_data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(payload)
+
+
+def _json_line(obj) -> bytes:
+    """Encode one JSON Lines record (compact, UTF-8, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+async def _write_jsonl(output_file: str, header: dict, items=None) -> int:
+    """
+    Stream records to a JSON Lines file as they arrive
+    
+    The header (metadata such as the user and extracted_at) is the first line,
+    followed by one line per item. Nothing is accumulated in memory, and items
+    written before a crash are kept.
+    
+    Fetching and writing run as separate tasks joined by a bounded queue, so
+    the next page of items is requested while earlier ones are encoded.
+    
+    Returns:
+        Number of items written (excluding the header)
+    """
+    queue = asyncio.Queue(maxsize=_JSONL_QUEUE_SIZE)
+    
+    async def produce():
+        if items is not None:
+            async for item in items:
+                await queue.put(item)
+        await queue.put(None)  # End of stream; only sent while the writer is running
+    
+    async def consume():
+        count = 0
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(_json_line(header))
+            while (item := await queue.get()) is not None:
+                f.write(_json_line(item))
+                count += 1
+        return count
+    
+    producer = asyncio.create_task(produce())
+    consumer = asyncio.create_task(consume())
+    tasks = (producer, consumer)
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # After an error on either side (or a cancellation) stop the other one
+        # explicitly: a producer blocked on a full queue would otherwise hang
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()  # Extraction or write error
+    return consumer.result()
+
+
+async def _iter_videos(videos, limit: int = None):
+    """Yield raw video dicts, reporting progress and stopping at limit."""
+    video_count = 0
+    async for video in videos:
+        yield video.as_dict
+        video_count += 1
+        
+        if video_count % _PROGRESS_EVERY == 0:
+            sys.stdout.write(f"{CYAN} Extracted {video_count} videos so far...\n")
+        if limit and video_count >= limit:
+            print(f"{CYAN} Reached limit of {limit} videos. Stopping extraction.")
+            break
+
+
+async def _collect(items, size_hint: int) -> list:
+    """Gather an async stream into a list pre-sized for the expected count (capped at _COLLECT_PRESIZE_MAX)."""
+    size_hint = min(size_hint, _COLLECT_PRESIZE_MAX)
+    collected = [None] * size_hint
+    n = 0
+    async for item in items:
+        if n < size_hint:
+            collected[n] = item
+        else:
+            collected.append(item)
+        n += 1
+    del collected[n:]
+    return collected
+
 
-async def scrape_user(username: str, ms_token: str, output_format: str = 'json', output_file: str = None, limit: int = None):
+async def _iter_comments(comments):
+    """Yield raw comment dicts, reporting progress."""
+    comment_count = 0
+    async for comment in comments:
+        yield comment.as_dict
+        comment_count += 1
+        if comment_count % _PROGRESS_EVERY == 0:
+            sys.stdout.write(f"{CYAN} Extracted {comment_count} comments so far...\n")
+
+
+def _csv_field(value) -> str:
+    """Encode one CSV field the way csv.writer does (minimal quoting)."""
+    if value.__class__ is not str:
+        if value is None:
+            return ''
+        if value.__class__ is int:  # Digits never need quoting
+            return str(value)
+        value = str(value)
+    if '"' in value:
+        return '"' + value.replace('"', '""') + '"'
+    if ',' in value or '\n' in value or '\r' in value:
+        return '"' + value + '"'
+    return value
+
+
+def _csv_rows(rows) -> bytes:
+    """Encode CSV records (CRLF-terminated, as csv.writer) to UTF-8 bytes."""
+    return ''.join([','.join(map(_csv_field, row)) + '\r\n' for row in rows]).encode('utf-8')
+
+
+async def _write_video_rows(f, videos, with_author: bool = True) -> int:
+    """
+    Write one CSV row per video to a binary file as it is extracted
+    
+    Only the CSV columns are read from each video; no list of videos is kept.
+    Every column goes through _csv_field, so rows match csv.writer output even
+    for missing (None) or string-valued stats. Encoded rows are written in
+    batches of _CSV_BATCH_SIZE.
+    
+    Returns:
+        Number of video rows written
+    """
+    count = 0
+    batch = []
+    async for video in videos:
+        stats = video.get('stats') or _EMPTY
+        desc = video.get('desc', '')
+        if len(desc) > _DESC_MAX_LEN:
+            desc = desc[:_DESC_MAX_LEN]  # Truncate description
+        row = [video.get('id', '')]
+        if with_author:
+            row.append((video.get('author') or _EMPTY).get('uniqueId', ''))
+        row += (
+            desc,
+            stats.get('diggCount', ''),
+            stats.get('shareCount', ''),
+            stats.get('commentCount', ''),
+            stats.get('playCount', ''),
+            video.get('createTime', ''),
+        )
+        batch.append(','.join(map(_csv_field, row)) + '\r\n')
+        if len(batch) >= _CSV_BATCH_SIZE:
+            f.write(''.join(batch).encode('utf-8'))
+            count += len(batch)
+            batch.clear()
+    f.write(''.join(batch).encode('utf-8'))
+    return count + len(batch)
+
+
+def _write_video_csv(output_file: str, video_info: dict, comments: list):
+    """Write video details, and comments if any, as CSV."""
+    stats = video_info.get('stats') or _EMPTY
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        # Write video info
+        writer.writerow(['Type', 'Field', 'Value'])
+        writer.writerow(['Video', 'id', video_info.get('id', '')])
+        writer.writerow(['Video', 'description', video_info.get('desc', '')])
+        writer.writerow(['Video', 'author', (video_info.get('author') or _EMPTY).get('uniqueId', '')])
+        writer.writerow(['Video', 'likes', stats.get('diggCount', '')])
+        writer.writerow(['Video', 'shares', stats.get('shareCount', '')])
+        writer.writerow(['Video', 'comments', stats.get('commentCount', '')])
+        writer.writerow(['Video', 'views', stats.get('playCount', '')])
+        if comments:
+            writer.writerow([])  # Empty row
+            writer.writerow(['Comment ID', 'Author', 'Text', 'Likes', 'Created'])
+            writer.writerows([
+                comment.get('id', ''),
+                comment.get('user', {}).get('uniqueId', ''),
+                comment.get('text', '')[:100],
+                comment.get('diggCount', ''),
+                comment.get('createTime', '')
+            ] for comment in comments)
+
+
+async def scrape_user(api: TikTokApi, username: str, output_format: str = 'json', output_file: str = None, limit: int = None):
     """
     Scrape user profile and videos
     
     Args:
+        api: TikTokApi instance with an active session
         username: TikTok username to scrape
-        ms_token: TikTok ms_token for authentication
-        output_format: Output format ('json' or 'csv')
+        output_format: Output format ('json', 'jsonl' or 'csv')
         output_file: Output file path (optional)
         limit: Maximum number of videos to scrape
     """
     try:
-        print(f"{CYAN} Initializing TikTok API...")
-        async with TikTokApi() as api:
-            print(f"{CYAN} Creating session with ms_token...")
-            await api.create_sessions(
-                ms_tokens=[ms_token],
-                num_sessions=1,
-                sleep_after=3,
-                browser=os.getenv("TIKTOK_BROWSER", "chromium"),
-            )
-            
-            print(f"{CYAN} Loading user profile: @{username}...")
-            user = api.user(username)
-            user_data = await user.info()
-            print(f"{GREEN} Profile loaded: {user_data.get('nickname', 'N/A')} (@{user_data.get('uniqueId', username)})")
-            print(f"{CYAN} Followers: {user_data.get('followerCount', 'N/A')}")
-            print(f"{CYAN} Following: {user_data.get('followingCount', 'N/A')}")
-            print(f"{CYAN} Videos: {user_data.get('videoCount', 'N/A')}")
-            
-            # Scrape user videos
-            print(f"{CYAN} Extracting videos...")
-            videos = []
-            video_count = 0
-            
-            async for video in user.videos(count=limit if limit else 1000):
-                video_dict = video.as_dict
-                videos.append(video_dict)
-                video_count += 1
-                
-                if video_count % 10 == 0:
-                    print(f"{CYAN} Extracted {video_count} videos so far...")
-                if limit and video_count >= limit:
-                    print(f"{CYAN} Reached limit of {limit} videos. Stopping extraction.")
-                    break
+        print(f"{CYAN} Loading user profile: @{username}...")
+        user = api.user(username)
+        user_data = await user.info()
+        print(f"{GREEN} Profile loaded: {user_data.get('nickname', 'N/A')} (@{user_data.get('uniqueId', username)})")
+        print(f"{CYAN} Followers: {user_data.get('followerCount', 'N/A')}")
+        print(f"{CYAN} Following: {user_data.get('followingCount', 'N/A')}")
+        print(f"{CYAN} Videos: {user_data.get('videoCount', 'N/A')}")
+        
+        # One clock read for both the default filename and extracted_at
+        now = datetime.now()
+        extracted_at = now.isoformat()
+        # Output path is needed up front when streaming
+        if not output_file:
+            output_file = f"tiktok_user_{username}_{now.strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        
+        # Scrape user videos
+        print(f"{CYAN} Extracting videos...")
+        count = limit if limit else 1000
+        videos = _iter_videos(user.videos(count=count), limit)
+        if output_format == 'jsonl':
+            # Stream each video to disk as soon as it is extracted
+            total_videos = await _write_jsonl(output_file, {"user": user_data, "extracted_at": extracted_at}, videos)
+        elif output_format == 'csv':
+            with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                # Write user info as header, then the video columns
+                f.write(_csv_rows([
+                    ['Type', 'Field', 'Value'],
+                    ['User', 'username', user_data.get('uniqueId', '')],
+                    ['User', 'nickname', user_data.get('nickname', '')],
+                    ['User', 'followers', user_data.get('followerCount', '')],
+                    ['User', 'following', user_data.get('followingCount', '')],
+                    ['User', 'videos', user_data.get('videoCount', '')],
+                    [],  # Empty row
+                    ['Video ID', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'],
+                ]))
+                total_videos = await _write_video_rows(f, videos, with_author=False)
+        else:
+            videos = await _collect(videos, count)
+            total_videos = len(videos)
             
             # Prepare output data
             output_data = {
                 "user": user_data,
                 "videos": videos,
-                "extracted_at": datetime.now().isoformat(),
-                "total_videos": len(videos)
+                "extracted_at": extracted_at,
+                "total_videos": total_videos
             }
-            
-            # Save output
-            if not output_file:
-                output_file = f"tiktok_user_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
-            
-            if output_format == 'json':
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
-            else:  # CSV
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    # Write user info as header
-                    writer.writerow(['Type', 'Field', 'Value'])
-                    writer.writerow(['User', 'username', user_data.get('uniqueId', '')])
-                    writer.writerow(['User', 'nickname', user_data.get('nickname', '')])
-                    writer.writerow(['User', 'followers', user_data.get('followerCount', '')])
-                    writer.writerow(['User', 'following', user_data.get('followingCount', '')])
-                    writer.writerow(['User', 'videos', user_data.get('videoCount', '')])
-                    writer.writerow([])  # Empty row
-                    # Write videos
-                    writer.writerow(['Video ID', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                    for video in videos:
-                        writer.writerow([
-                            video.get('id', ''),
-                            video.get('desc', '')[:100],  # Truncate description
-                            video.get('stats', {}).get('diggCount', ''),
-                            video.get('stats', {}).get('shareCount', ''),
-                            video.get('stats', {}).get('commentCount', ''),
-                            video.get('stats', {}).get('playCount', ''),
-                            video.get('createTime', '')
-                        ])
-            
-            print(f"{GREEN} Data saved to: {output_file}")
-            print(f"{GREEN} Total videos extracted: {len(videos)}")
-            
-    except Exception as e:
+            await asyncio.to_thread(_write_json, output_file, output_data)
+        
+        print(f"{GREEN} Data saved to: {output_file}")
+        print(f"{GREEN} Total videos extracted: {total_videos}")
+        
+    except _SCRAPE_ERRORS as e:
         print(f"{RED} Error scraping user: {e}")
-        import traceback
         traceback.print_exc()
-        sys.exit(1)
+        raise
 
 
-async def scrape_trending(ms_token: str, output_format: str = 'json', output_file: str = None, limit: int = None):
+async def scrape_trending(api: TikTokApi, output_format: str = 'json', output_file: str = None, limit: int = None):
     """
     Scrape trending videos
     
     Args:
-        ms_token: TikTok ms_token for authentication
-        output_format: Output format ('json' or 'csv')
+        api: TikTokApi instance with an active session
+        output_format: Output format ('json', 'jsonl' or 'csv')
         output_file: Output file path (optional)
         limit: Maximum number of videos to scrape
     """
     try:
-        print(f"{CYAN} Initializing TikTok API...")
-        async with TikTokApi() as api:
-            print(f"{CYAN} Creating session with ms_token...")
-            await api.create_sessions(
-                ms_tokens=[ms_token],
-                num_sessions=1,
-                sleep_after=3,
-                browser=os.getenv("TIKTOK_BROWSER", "chromium"),
-            )
-            
-            print(f"{CYAN} Extracting trending videos...")
-            videos = []
-            video_count = 0
-            
-            async for video in api.trending.videos(count=limit if limit else 100):
-                video_dict = video.as_dict
-                videos.append(video_dict)
-                video_count += 1
-                
-                if video_count % 10 == 0:
-                    print(f"{CYAN} Extracted {video_count} videos so far...")
-                if limit and video_count >= limit:
-                    print(f"{CYAN} Reached limit of {limit} videos. Stopping extraction.")
-                    break
+        # One clock read for both the default filename and extracted_at
+        now = datetime.now()
+        extracted_at = now.isoformat()
+        # Output path is needed up front when streaming
+        if not output_file:
+            output_file = f"tiktok_trending_{now.strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        
+        print(f"{CYAN} Extracting trending videos...")
+        count = limit if limit else 100
+        videos = _iter_videos(api.trending.videos(count=count), limit)
+        if output_format == 'jsonl':
+            # Stream each video to disk as soon as it is extracted
+            total_videos = await _write_jsonl(output_file, {"extracted_at": extracted_at}, videos)
+        elif output_format == 'csv':
+            with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(_csv_rows([['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created']]))
+                total_videos = await _write_video_rows(f, videos)
+        else:
+            videos = await _collect(videos, count)
+            total_videos = len(videos)
             
             # Prepare output data
             output_data = {
                 "videos": videos,
-                "extracted_at": datetime.now().isoformat(),
-                "total_videos": len(videos)
+                "extracted_at": extracted_at,
+                "total_videos": total_videos
             }
-            
-            # Save output
-            if not output_file:
-                output_file = f"tiktok_trending_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
-            
-            if output_format == 'json':
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
-            else:  # CSV
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                    for video in videos:
-                        writer.writerow([
-                            video.get('id', ''),
-                            video.get('author', {}).get('uniqueId', ''),
-                            video.get('desc', '')[:100],
-                            video.get('stats', {}).get('diggCount', ''),
-                            video.get('stats', {}).get('shareCount', ''),
-                            video.get('stats', {}).get('commentCount', ''),
-                            video.get('stats', {}).get('playCount', ''),
-                            video.get('createTime', '')
-                        ])
-            
-            print(f"{GREEN} Data saved to: {output_file}")
-            print(f"{GREEN} Total videos extracted: {len(videos)}")
-            
-    except Exception as e:
+            await asyncio.to_thread(_write_json, output_file, output_data)
+        
+        print(f"{GREEN} Data saved to: {output_file}")
+        print(f"{GREEN} Total videos extracted: {total_videos}")
+        
+    except _SCRAPE_ERRORS as e:
         print(f"{RED} Error scraping trending: {e}")
-        import traceback
         traceback.print_exc()
-        sys.exit(1)
+        raise
 
 
-async def scrape_hashtag(hashtag: str, ms_token: str, output_format: str = 'json', output_file: str = None, limit: int = None):
+async def scrape_hashtag(api: TikTokApi, hashtag: str, output_format: str = 'json', output_file: str = None, limit: int = None):
     """
     Scrape videos by hashtag
     
     Args:
+        api: TikTokApi instance with an active session
         hashtag: Hashtag name (without #)
-        ms_token: TikTok ms_token for authentication
-        output_format: Output format ('json' or 'csv')
+        output_format: Output format ('json', 'jsonl' or 'csv')
         output_file: Output file path (optional)
         limit: Maximum number of videos to scrape
     """
     try:
-        print(f"{CYAN} Initializing TikTok API...")
-        async with TikTokApi() as api:
-            print(f"{CYAN} Creating session with ms_token...")
-            await api.create_sessions(
-                ms_tokens=[ms_token],
-                num_sessions=1,
-                sleep_after=3,
-                browser=os.getenv("TIKTOK_BROWSER", "chromium"),
-            )
-            
-            print(f"{CYAN} Loading hashtag: #{hashtag}...")
-            tag = api.hashtag(name=hashtag)
-            
-            print(f"{CYAN} Extracting videos...")
-            videos = []
-            video_count = 0
-            
-            async for video in tag.videos(count=limit if limit else 100):
-                video_dict = video.as_dict
-                videos.append(video_dict)
-                video_count += 1
-                
-                if video_count % 10 == 0:
-                    print(f"{CYAN} Extracted {video_count} videos so far...")
-                if limit and video_count >= limit:
-                    print(f"{CYAN} Reached limit of {limit} videos. Stopping extraction.")
-                    break
+        print(f"{CYAN} Loading hashtag: #{hashtag}...")
+        tag = api.hashtag(name=hashtag)
+        
+        # One clock read for both the default filename and extracted_at
+        now = datetime.now()
+        extracted_at = now.isoformat()
+        # Output path is needed up front when streaming
+        if not output_file:
+            output_file = f"tiktok_hashtag_{hashtag}_{now.strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        
+        print(f"{CYAN} Extracting videos...")
+        count = limit if limit else 100
+        videos = _iter_videos(tag.videos(count=count), limit)
+        if output_format == 'jsonl':
+            # Stream each video to disk as soon as it is extracted
+            total_videos = await _write_jsonl(output_file, {"hashtag": hashtag, "extracted_at": extracted_at}, videos)
+        elif output_format == 'csv':
+            with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(_csv_rows([['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created']]))
+                total_videos = await _write_video_rows(f, videos)
+        else:
+            videos = await _collect(videos, count)
+            total_videos = len(videos)
             
             # Prepare output data
             output_data = {
                 "hashtag": hashtag,
                 "videos": videos,
-                "extracted_at": datetime.now().isoformat(),
-                "total_videos": len(videos)
+                "extracted_at": extracted_at,
+                "total_videos": total_videos
             }
-            
-            # Save output
-            if not output_file:
-                output_file = f"tiktok_hashtag_{hashtag}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
-            
-            if output_format == 'json':
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
-            else:  # CSV
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                    for video in videos:
-                        writer.writerow([
-                            video.get('id', ''),
-                            video.get('author', {}).get('uniqueId', ''),
-                            video.get('desc', '')[:100],
-                            video.get('stats', {}).get('diggCount', ''),
-                            video.get('stats', {}).get('shareCount', ''),
-                            video.get('stats', {}).get('commentCount', ''),
-                            video.get('stats', {}).get('playCount', ''),
-                            video.get('createTime', '')
-                        ])
-            
-            print(f"{GREEN} Data saved to: {output_file}")
-            print(f"{GREEN} Total videos extracted: {len(videos)}")
-            
-    except Exception as e:
+            await asyncio.to_thread(_write_json, output_file, output_data)
+        
+        print(f"{GREEN} Data saved to: {output_file}")
+        print(f"{GREEN} Total videos extracted: {total_videos}")
+        
+    except _SCRAPE_ERRORS as e:
         print(f"{RED} Error scraping hashtag: {e}")
-        import traceback
         traceback.print_exc()
-        sys.exit(1)
+        raise
 
 
-async def scrape_video(video_id: str, ms_token: str, output_format: str = 'json', output_file: str = None, include_comments: bool = False, comment_limit: int = 30):
+async def scrape_video(api: TikTokApi, video_id: str, output_format: str = 'json', output_file: str = None, include_comments: bool = False, comment_limit: int = 30):
     """
     Scrape video details and optionally comments
     
     Args:
+        api: TikTokApi instance with an active session
         video_id: TikTok video ID or URL
-        ms_token: TikTok ms_token for authentication
-        output_format: Output format ('json' or 'csv')
+        output_format: Output format ('json', 'jsonl' or 'csv')
         output_file: Output file path (optional)
         include_comments: Whether to scrape comments
         comment_limit: Maximum number of comments to scrape
     """
+    try:
+        print(f"{CYAN} Loading video: {video_id}...")
+        # Extract video ID from URL if needed
+        if 'tiktok.com' in video_id:
+            # Try to extract ID from URL
+            video = api.video(url=video_id)
+        else:
+            video = api.video(id=video_id)
+        
+        video_info = await video.info()
+        print(f"{GREEN} Video loaded: {video_info.get('desc', 'N/A')[:50]}...")
+        
+        # One clock read for both the default filename and extracted_at
+        now = datetime.now()
+        extracted_at = now.isoformat()
+        # Output path is needed up front when streaming
+        if not output_file:
+            output_file = f"tiktok_video_{video_id}_{now.strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        
+        # Get comments if requested
+        comments = []
+        if include_comments:
+            print(f"{CYAN} Extracting comments...")
+            comments = _iter_comments(video.comments(count=comment_limit))
+        
+        if output_format == 'jsonl':
+            # Video info on the first line, then one comment per line
+            header = {"video": video_info, "extracted_at": extracted_at}
+            total_comments = await _write_jsonl(output_file, header, comments if include_comments else None)
+            if include_comments:
+                print(f"{GREEN} Total comments extracted: {total_comments}")
+            print(f"{GREEN} Data saved to: {output_file}")
+            return
+        
+        if include_comments:
+            comments = [comment async for comment in comments]
+            print(f"{GREEN} Total comments extracted: {len(comments)}")
+        
+        # Prepare output data
+        output_data = {
+            "video": video_info,
+            "extracted_at": extracted_at
+        }
+        if include_comments:
+            output_data["comments"] = comments
+            output_data["total_comments"] = len(comments)
+        
+        # Save output (serialization runs off the event loop)
+        if output_format == 'json':
+            await asyncio.to_thread(_write_json, output_file, output_data)
+        else:  # CSV
+            await asyncio.to_thread(_write_video_csv, output_file, video_info, comments)
+        
+        print(f"{GREEN} Data saved to: {output_file}")
+        
+    except _SCRAPE_ERRORS as e:
+        print(f"{RED} Error scraping video: {e}")
+        traceback.print_exc()
+        raise
+
+
+class _TokenBucket:
+    """Minimal token bucket: acquire() waits until a token is available."""
+    
+    def __init__(self, rate: float, capacity: float = 1):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = None
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+def _target_output(output_file: str, target: str) -> str:
+    """Derive a per-target output path (name_<target>.ext) for multi-target runs."""
+    path = Path(output_file)
+    slug = re.sub(r'[^\w.-]+', '_', target).strip('_')
+    return str(path.with_name(f"{path.stem}_{slug}{path.suffix}"))
+
+
+def _target_outputs(output_file: str, targets: list) -> list:
+    """
+    Output path per target (None: auto-generated by the scrape function)
+    
+    Raises:
+        ValueError: If two targets would write the same file
+    """
+    if not output_file or len(targets) < 2:
+        return [output_file] * len(targets)
+    outputs = [_target_output(output_file, target) for target in targets]
+    seen = {}
+    for target, output in zip(targets, outputs):
+        if output in seen:
+            raise ValueError(f"Targets {seen[output]!r} and {target!r} would both write {output}")
+        seen[output] = target
+    return outputs
+
+
+async def scrape_many(mode: str, targets: list, ms_token: str, output_format: str = 'json', output_file: str = None,
+                      limit: int = None, include_comments: bool = False, comment_limit: int = 30):
+    """
+    Scrape one or more targets over a single TikTok API session
+    
+    Starting the browser session is the slowest step of a run, so it is done
+    once and shared by every target. Up to _MAX_CONCURRENT_TARGETS targets
+    are scraped at once, and new ones start no faster than _TARGET_START_RATE
+    per second to stay clear of TikTok's rate limiting.
+    
+    Args:
+        mode: Scraping mode ('user', 'trending', 'hashtag' or 'video')
+        targets: Usernames, hashtags or video IDs/URLs (ignored for trending)
+        ms_token: TikTok ms_token for authentication
+        output_format: Output format ('json', 'jsonl' or 'csv')
+        output_file: Output file path (optional). With several targets, each
+            target's name is appended to it; ValueError is raised if two
+            targets map to the same path
+        limit: Maximum number of videos to scrape
+        include_comments: Whether to scrape comments (video mode)
+        comment_limit: Maximum number of comments to scrape (video mode)
+    
+    Returns:
+        Targets that failed with an expected error (each already reported).
+        One such failure does not stop the remaining targets; an unexpected
+        error cancels them and is raised
+    """
+    # Checked before the session starts: concurrent jobs must not share a file
+    outputs = _target_outputs(output_file, targets) if mode != 'trending' else []
+    
     try:
         print(f"{CYAN} Initializing TikTok API...")
         async with TikTokApi() as api:
@@ -303,76 +598,62 @@ async def scrape_video(video_id: str, ms_token: str, output_format: str = 'json'
                 browser=os.getenv("TIKTOK_BROWSER", "chromium"),
             )
             
-            print(f"{CYAN} Loading video: {video_id}...")
-            # Extract video ID from URL if needed
-            if 'tiktok.com' in video_id:
-                # Try to extract ID from URL
-                video = api.video(url=video_id)
-            else:
-                video = api.video(id=video_id)
-            
-            video_info = await video.info()
-            print(f"{GREEN} Video loaded: {video_info.get('desc', 'N/A')[:50]}...")
+            async def guarded(name: str, job) -> bool:
+                """Await one target's scrape; False if it failed with an expected error."""
+                try:
+                    await job
+                except _SCRAPE_ERRORS:
+                    return False  # Already reported by the scrape function
+                except Exception as e:
+                    print(f"{RED} Unexpected error scraping {name}, stopping: {e!r}")
+                    raise
+                return True
             
-            # Get comments if requested
-            comments = []
-            if include_comments:
-                print(f"{CYAN} Extracting comments...")
-                comment_count = 0
-                async for comment in video.comments(count=comment_limit):
-                    comments.append(comment.as_dict)
-                    comment_count += 1
-                    if comment_count % 10 == 0:
-                        print(f"{CYAN} Extracted {comment_count} comments so far...")
-                print(f"{GREEN} Total comments extracted: {len(comments)}")
-            
-            # Prepare output data
-            output_data = {
-                "video": video_info,
-                "extracted_at": datetime.now().isoformat()
-            }
-            if include_comments:
-                output_data["comments"] = comments
-                output_data["total_comments"] = len(comments)
-            
-            # Save output
-            if not output_file:
-                output_file = f"tiktok_video_{video_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
-            
-            if output_format == 'json':
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
-            else:  # CSV
-                with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    # Write video info
-                    writer.writerow(['Type', 'Field', 'Value'])
-                    writer.writerow(['Video', 'id', video_info.get('id', '')])
-                    writer.writerow(['Video', 'description', video_info.get('desc', '')])
-                    writer.writerow(['Video', 'author', video_info.get('author', {}).get('uniqueId', '')])
-                    writer.writerow(['Video', 'likes', video_info.get('stats', {}).get('diggCount', '')])
-                    writer.writerow(['Video', 'shares', video_info.get('stats', {}).get('shareCount', '')])
-                    writer.writerow(['Video', 'comments', video_info.get('stats', {}).get('commentCount', '')])
-                    writer.writerow(['Video', 'views', video_info.get('stats', {}).get('playCount', '')])
-                    if include_comments and comments:
-                        writer.writerow([])  # Empty row
-                        writer.writerow(['Comment ID', 'Author', 'Text', 'Likes', 'Created'])
-                        for comment in comments:
-                            writer.writerow([
-                                comment.get('id', ''),
-                                comment.get('user', {}).get('uniqueId', ''),
-                                comment.get('text', '')[:100],
-                                comment.get('diggCount', ''),
-                                comment.get('createTime', '')
-                            ])
+            if mode == 'trending':
+                names = ['trending']
+                jobs = [scrape_trending(api, output_format, output_file, limit)]
+            else:
+                # Per-target scrape call for each mode
+                scrapers = {
+                    'user': lambda target, output: scrape_user(api, target, output_format, output, limit),
+                    'hashtag': lambda target, output: scrape_hashtag(api, target, output_format, output, limit),
+                    'video': lambda target, output: scrape_video(api, target, output_format, output,
+                                                                 include_comments, comment_limit),
+                }
+                scrape = scrapers[mode]
+                
+                # Targets run concurrently, a few at a time, with paced start-up
+                semaphore = asyncio.Semaphore(_MAX_CONCURRENT_TARGETS)
+                limiter = _TokenBucket(_TARGET_START_RATE)
+                
+                async def scrape_one(target: str, target_output: str):
+                    async with semaphore:
+                        await limiter.acquire()
+                        await scrape(target, target_output)
+                
+                names = targets
+                jobs = [scrape_one(target, output) for target, output in zip(targets, outputs)]
             
-            print(f"{GREEN} Data saved to: {output_file}")
+            # Expected failures come back as False, so the other targets still
+            # run; anything else stops the whole run at once
+            tasks = [asyncio.ensure_future(guarded(name, job)) for name, job in zip(names, jobs)]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
             
-    except Exception as e:
-        print(f"{RED} Error scraping video: {e}")
-        import traceback
+    except _SCRAPE_ERRORS as e:
+        print(f"{RED} Error initializing TikTok API: {e}")
         traceback.print_exc()
         sys.exit(1)
+    
+    failed = [name for name, ok in zip(names, results) if not ok]
+    if failed:
+        print(f"{RED} {len(failed)} of {len(names)} target(s) failed: {', '.join(failed)}")
+    return failed
 
 
 def main():
@@ -380,11 +661,12 @@ def main():
     parser.add_argument('-m', '--mode', choices=['user', 'trending', 'hashtag', 'video'], required=True,
                         help='Scraping mode: user, trending, hashtag, or video')
     parser.add_argument('-t', '--target', required=True,
-                        help='Target: username (for user), hashtag name (for hashtag), or video ID/URL (for video). Ignored for trending.')
+                        help='Target: username (for user), hashtag name (for hashtag), or video ID/URL (for video). '
+                             'Separate several targets with commas to scrape them in one session. Ignored for trending.')
     parser.add_argument('-s', '--session', required=True,
                         help='Path to file containing ms_token (or ms_token value itself)')
-    parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json',
-                        help='Output format (default: json)')
+    parser.add_argument('-f', '--format', choices=['json', 'jsonl', 'csv'], default='json',
+                        help='Output format (default: json). jsonl streams one record per line as it is scraped')
     parser.add_argument('-o', '--output', help='Output file path (optional, auto-generated if not provided)')
     parser.add_argument('-l', '--limit', type=int, help='Maximum number of items to scrape (videos/comments)')
     parser.add_argument('--comments', action='store_true', help='Include comments when scraping video (video mode only)')
@@ -393,20 +675,27 @@ def main():
     args = parser.parse_args()
     
     # Read ms_token from file or use directly
-    ms_token = args.session
-    if os.path.exists(args.session):
-        with open(args.session, 'r') as f:
-            ms_token = f.read().strip()
+    try:
+        ms_token = Path(args.session).read_text().strip()
+    except (OSError, ValueError):
+        ms_token = args.session
     
-    # Run appropriate scraper function
-    if args.mode == 'user':
-        asyncio.run(scrape_user(args.target, ms_token, args.format, args.output, args.limit))
-    elif args.mode == 'trending':
-        asyncio.run(scrape_trending(ms_token, args.format, args.output, args.limit))
-    elif args.mode == 'hashtag':
-        asyncio.run(scrape_hashtag(args.target, ms_token, args.format, args.output, args.limit))
-    elif args.mode == 'video':
-        asyncio.run(scrape_video(args.target, ms_token, args.format, args.output, args.comments, args.comment_limit if args.comments else None))
+    # Comma-separated targets share one session; repeats are scraped once
+    targets = list(dict.fromkeys(target.strip() for target in args.target.split(',') if target.strip()))
+    if args.mode != 'trending':
+        try:
+            _target_outputs(args.output, targets)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # uvloop.run needs uvloop >= 0.18; older releases install their loop policy instead
+    if uvloop is not None and not hasattr(uvloop, 'run'):
+        uvloop.install()
+    run = getattr(uvloop, 'run', None) or asyncio.run
+    failed = run(scrape_many(args.mode, targets, ms_token, args.format, args.output, args.limit,
+                             args.comments, args.comment_limit))
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -11,10 +11,57 @@ import json
 import csv
 import argparse
 import os
+import multiprocessing
 from pathlib import Path
 from datetime import datetime
 import random
+import itertools
+from operator import itemgetter
+import hashlib
 import time
+import traceback
+
+# Stdlib JSON encoders, built once rather than per json.dumps call. Compact
+# separators keep the stdlib on its C encoder; indent forces the Python one
+_ENCODE = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_ENCODE_PRETTY = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+# Optional: faster JSON encoders for large mock outputs, best first
+# (orjson, msgspec, ujson, then the stdlib). _fast_dumps(obj) returns
+# compact UTF-8 JSON bytes from whichever is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _fast_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+else:
+    try:
+        import msgspec.json
+        _fast_dumps = msgspec.json.Encoder().encode
+    except ImportError:
+        try:
+            import ujson
+            
+            def _fast_dumps(obj) -> bytes:
+                return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+        except ImportError:
+            def _fast_dumps(obj) -> bytes:
+                return _ENCODE(obj).encode('utf-8')
+
+# Output files use a large buffer so CSV rows coalesce into few write syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Mock records are drawn and generated _CHUNK_SIZE at a time, so streamed CSV
+# and JSONL output holds one chunk in memory whatever the record count. Follower
+# runs larger than _PARALLEL_MIN_ITEMS spread the chunks across CPU cores
+_PARALLEL_MIN_ITEMS = 10000
+_CHUNK_SIZE = 5000
+
+# Minimum seconds between progress lines in generation loops
+_PROGRESS_INTERVAL = 0.25
 
 # Color output (simple ASCII for cross-platform compatibility)
 GREEN = "[OK]"
@@ -23,16 +70,88 @@ YELLOW = "[!]"
 CYAN = "[*]"
 
 
-def generate_mock_user_data(username: str):
-    """Generate mock user profile data."""
+class _Progress:
+    """
+    Time-throttled "N items so far" reporter
+    
+    Prints at most once per _PROGRESS_INTERVAL seconds, and not at all when
+    stdout is not a terminal (pipes, CI logs), where the lines would only add
+    I/O to large runs.
+    """
+    
+    def __init__(self, template: str):
+        self._template = template
+        self._enabled = sys.stdout.isatty()
+        self._last = time.monotonic()
+    
+    def update(self, count: int):
+        if self._enabled:
+            now = time.monotonic()
+            if now - self._last >= _PROGRESS_INTERVAL:
+                self._last = now
+                sys.stdout.write(self._template.format(count) + '\n')
+
+
+def _dump_json(obj, path: str, pretty: bool = False):
+    """Write obj to path as UTF-8 JSON (compact unless pretty) in a single write."""
+    if not pretty:
+        payload = _fast_dumps(obj)
+    elif orjson is not None:
+        payload = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+    else:
+        payload = _ENCODE_PRETTY(obj).encode('utf-8')
+    # One write of the whole document; json.dump writes each encoded chunk separately
+    Path(path).write_bytes(payload)
+
+
+def _json_line(obj) -> bytes:
+    """Encode one JSON Lines record (compact, UTF-8, newline-terminated)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return _fast_dumps(obj) + b'\n'
+
+
+def _write_jsonl(path: str, header: dict, items=None) -> int:
+    """
+    Write a JSON Lines file: header first, then one line per item
+    
+    Items are written as they are produced, so a generator is never held in
+    memory as a whole.
+    
+    Returns:
+        Number of items written (excluding the header)
+    """
+    count = 0
+    with open(path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(_json_line(header))
+        if items is not None:
+            for item in items:
+                f.write(_json_line(item))
+                count += 1
+    return count
+
+
+def _seeded_rng(name: str) -> random.Random:
+    """
+    Random generator seeded from a name (username, hashtag or video ID)
+    
+    The same target produces the same mock data on every run. blake2b keeps
+    the seed stable across processes, unlike the salted built-in hash().
+    """
+    seed = int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'big')
+    return random.Random(seed)
+
+
+def generate_mock_user_data(username: str, rng=random):
+    """Generate mock user profile data (rng: random.Random or the random module)."""
     return {
         "uniqueId": username,
         "nickname": f"{username.capitalize()} User",
-        "followerCount": random.randint(1000, 50000000),
-        "followingCount": random.randint(50, 5000),
-        "videoCount": random.randint(10, 5000),
-        "verified": random.choice([True, False]),
-        "privateAccount": random.choice([True, False]),
+        "followerCount": rng.randint(1000, 50000000),
+        "followingCount": rng.randint(50, 5000),
+        "videoCount": rng.randint(10, 5000),
+        "verified": rng.choice([True, False]),
+        "privateAccount": rng.choice([True, False]),
         "bioDescription": f"Mock bio for {username}",
         "avatarLarger": f"https://example.com/avatars/{username}.jpg",
         "avatarMedium": f"https://example.com/avatars/{username}_medium.jpg",
@@ -40,156 +159,362 @@ def generate_mock_user_data(username: str):
     }
 
 
-def generate_mock_video(index: int, username: str):
-    """Generate mock video data."""
-    video_id = random.randint(7000000000000000000, 7999999999999999999)
+# Mock videos carry no hashtags/mentions. One shared immutable value (encoded as
+# [] by both JSON encoders) instead of a new list per record; the records
+# themselves stay dict literals, the fastest way CPython builds a dict
+_NO_TEXT_EXTRA = ()
+
+# Random integer ranges (inclusive) drawn per mock record, in draw order
+_VIDEO_RANGES = (
+    (7000000000000000000, 7999999999999999999),  # id
+    (0, 86400 * 365),       # age: random time in last year
+    (100, 10000000),        # diggCount (likes)
+    (10, 1000000),          # shareCount
+    (5, 500000),            # commentCount
+    (1000, 100000000),      # playCount (views)
+    (5, 60),                # duration
+)
+_COMMENT_RANGES = (
+    (7000000000000000000, 7999999999999999999),  # id
+    (0, 86400 * 30),        # age: random time in last month
+    (0, 10000),             # diggCount
+    (1, 1000),              # commenter number
+)
+_FOLLOWER_RANGES = (
+    (1000000000000000000, 9999999999999999999),  # id
+    (10, 500000),           # followerCount
+    (5, 2000),              # followingCount
+    (0, 1000),              # videoCount
+    (0, 1),                 # verified
+    (0, 1),                 # privateAccount
+)
+
+# CSV column projections. Mock records always carry the full schema, so rows
+# are built with C-level itemgetter lookups instead of chained .get() defaults
+_FOLLOWER_CSV_FIELDS = itemgetter(
+    'id', 'uniqueId', 'nickname', 'followerCount', 'followingCount', 'videoCount', 'verified',
+)
+_STATS_CSV_FIELDS = itemgetter('diggCount', 'shareCount', 'commentCount', 'playCount')
+
+
+def _rand_column(low: int, high: int, n: int, rng=random) -> list:
+    """
+    Draw n random integers in [low, high] in one pass
+    
+    Stdlib counterpart of numpy's rng.integers(low, high + 1, size=n): a single
+    comprehension over the C-level random()/getrandbits() instead of n calls
+    to random.randint, each of which runs several Python-level frames.
+    """
+    span = high - low + 1
+    if span <= 1 << 53:  # Exactly representable in a float
+        rand = rng.random
+        return [low + int(rand() * span) for _ in range(n)]
+    # Spare bits keep the modulo bias below 1/256. Unpacking os.urandom()
+    # with struct is no faster here and would ignore a seeded rng
+    bits = span.bit_length() + 8
+    getrandbits = rng.getrandbits
+    return [low + getrandbits(bits) % span for _ in range(n)]
+
+
+def _rand_rows(ranges: tuple, n: int, rng=random):
+    """Draw the random values for n mock records column by column; yields one tuple per record."""
+    return zip(*[_rand_column(low, high, n, rng) for low, high in ranges])
+
+
+def _chunked_rows(ranges: tuple, n: int, rng=random):
+    """Like _rand_rows, but draws the columns _CHUNK_SIZE records at a time."""
+    for start in range(0, n, _CHUNK_SIZE):
+        yield from _rand_rows(ranges, min(_CHUNK_SIZE, n - start), rng)
+
+
+def _chunked_choices(population, n: int, rng=random):
+    """Yield n random picks from population, drawn _CHUNK_SIZE at a time."""
+    for start in range(0, n, _CHUNK_SIZE):
+        yield from rng.choices(population, k=min(_CHUNK_SIZE, n - start))
+
+
+def generate_mock_video(index: int, username: str, now_ts: int = None, draws: tuple = None, rng=random,
+                        author: dict = None):
+    """
+    Generate mock video data
+    
+    Args:
+        index: Position of the video in the run
+        username: Author username
+        now_ts: Current Unix time (default: now)
+        draws: One row from _rand_rows(_VIDEO_RANGES, ...) (default: drawn from rng)
+        rng: Random generator (random.Random or the random module)
+        author: Shared read-only author dict (default: built from username)
+    """
+    if now_ts is None:
+        now_ts = int(datetime.now().timestamp())
+    if draws is None:
+        draws = next(_rand_rows(_VIDEO_RANGES, 1, rng))
+    if author is None:
+        author = {"uniqueId": username, "nickname": username.capitalize() + " User"}
+    video_id, age, likes, shares, comments, views, duration = draws
+    video_id = str(video_id)
+    # Plain dict literals on purpose: they build faster than dataclass
+    # instances, serialize on every JSON backend, and callers edit them in place
     return {
-        "id": str(video_id),
+        "id": video_id,
         "desc": f"Mock video description {index + 1} - This is a test video for {username}",
-        "createTime": int(datetime.now().timestamp()) - random.randint(0, 86400 * 365),  # Random time in last year
-        "author": {
-            "uniqueId": username,
-            "nickname": f"{username.capitalize()} User",
-        },
+        "createTime": now_ts - age,  # Random time in last year
+        "author": author,
         "stats": {
-            "diggCount": random.randint(100, 10000000),  # Likes
-            "shareCount": random.randint(10, 1000000),   # Shares
-            "commentCount": random.randint(5, 500000),   # Comments
-            "playCount": random.randint(1000, 100000000),  # Views
+            "diggCount": likes,
+            "shareCount": shares,
+            "commentCount": comments,
+            "playCount": views,
         },
         "video": {
-            "downloadAddr": f"https://example.com/videos/{video_id}.mp4",
-            "cover": f"https://example.com/covers/{video_id}.jpg",
-            "duration": random.randint(5, 60),
+            "downloadAddr": "https://example.com/videos/" + video_id + ".mp4",
+            "cover": "https://example.com/covers/" + video_id + ".jpg",
+            "duration": duration,
         },
         "music": {
             "title": f"Mock Music {index + 1}",
             "authorName": "Mock Artist",
         },
-        "textExtra": [],
+        "textExtra": _NO_TEXT_EXTRA,
     }
 
 
-def generate_mock_comment(index: int):
-    """Generate mock comment data."""
+def generate_mock_comment(index: int, now_ts: int = None, draws: tuple = None, rng=random):
+    """
+    Generate mock comment data
+    
+    Args:
+        index: Position of the comment in the run
+        now_ts: Current Unix time (default: now)
+        draws: One row from _rand_rows(_COMMENT_RANGES, ...) (default: drawn from rng)
+        rng: Random generator (random.Random or the random module)
+    """
+    if now_ts is None:
+        now_ts = int(datetime.now().timestamp())
+    if draws is None:
+        draws = next(_rand_rows(_COMMENT_RANGES, 1, rng))
+    comment_id, age, likes, commenter = draws
     return {
-        "id": str(random.randint(7000000000000000000, 7999999999999999999)),
+        "id": str(comment_id),
         "text": f"Mock comment {index + 1} - This is a test comment",
-        "createTime": int(datetime.now().timestamp()) - random.randint(0, 86400 * 30),  # Random time in last month
-        "diggCount": random.randint(0, 10000),
+        "createTime": now_ts - age,  # Random time in last month
+        "diggCount": likes,
         "user": {
-            "uniqueId": f"user{random.randint(1, 1000)}",
+            "uniqueId": f"user{commenter}",
             "nickname": f"Commenter {index + 1}",
         },
     }
 
 
-def generate_mock_follower(index: int):
-    """Generate mock follower data."""
-    follower_id = random.randint(1000000000000000000, 9999999999999999999)
-    usernames = [
-        f"user{random.randint(1, 999)}", 
-        f"creator{random.randint(1, 99)}",
-        f"tiktoker{random.randint(1, 99)}",
-        f"fan{random.randint(1, 99)}",
-        f"viewer{random.randint(1, 99)}"
-    ]
-    username = random.choice(usernames)
+# Follower usernames: a random prefix plus a number from 1 to its maximum
+_FOLLOWER_NAME_BASES = (("user", 999), ("creator", 99), ("tiktoker", 99), ("fan", 99), ("viewer", 99))
+
+
+def _follower_names(n: int, rng=random) -> list:
+    """Pick n mock follower usernames (one random.choices call for all prefixes)."""
+    rand = rng.random
+    return [f"{prefix}{1 + int(rand() * top)}" for prefix, top in rng.choices(_FOLLOWER_NAME_BASES, k=n)]
+
+
+def generate_mock_follower(index: int, username: str = None, draws: tuple = None, rng=random):
+    """
+    Generate mock follower data
+    
+    Args:
+        index: Position of the follower in the run
+        username: Follower username, as from _follower_names (default: drawn from rng)
+        draws: One row from _rand_rows(_FOLLOWER_RANGES, ...) (default: drawn from rng)
+        rng: Random generator (random.Random or the random module)
+    """
+    if username is None:
+        username = _follower_names(1, rng)[0]
+    if draws is None:
+        draws = next(_rand_rows(_FOLLOWER_RANGES, 1, rng))
+    follower_id, follower_count, following_count, video_count, verified, private = draws
     
     return {
         "id": str(follower_id),
         "uniqueId": username,
-        "nickname": f"{username.capitalize()} User",
-        "followerCount": random.randint(10, 500000),
-        "followingCount": random.randint(5, 2000),
-        "videoCount": random.randint(0, 1000),
-        "verified": random.choice([True, False]),
-        "privateAccount": random.choice([True, False]),
-        "bioDescription": f"Mock bio for {username}",
-        "avatarLarger": f"https://example.com/avatars/{username}.jpg",
+        "nickname": username.capitalize() + " User",
+        "followerCount": follower_count,
+        "followingCount": following_count,
+        "videoCount": video_count,
+        "verified": bool(verified),
+        "privateAccount": bool(private),
+        "bioDescription": "Mock bio for " + username,
+        "avatarLarger": "https://example.com/avatars/" + username + ".jpg",
     }
 
 
-def mock_scrape_user(username: str, output_format: str = 'json', output_file: str = None, limit: int = None, include_followers: bool = False, follower_limit: int = None, quiet: bool = False):
+def _chunk_tasks(count: int, rng=random):
+    """Split count items into independently seeded (start, size, seed) chunk tasks."""
+    base_seed = rng.getrandbits(64)
+    return [(start, min(_CHUNK_SIZE, count - start), base_seed + start)
+            for start in range(0, count, _CHUNK_SIZE)]
+
+
+def _gen_follower_chunk(task: tuple) -> list:
+    """Generate one chunk of mock followers from its own seed (in a worker for large runs)."""
+    start, size, seed = task
+    # Own generator per chunk: forked workers would otherwise repeat the parent's
+    # state, and chunks come out the same whichever process generates them
+    rng = random.Random(seed)
+    rows = zip(_follower_names(size, rng), _rand_rows(_FOLLOWER_RANGES, size, rng))
+    return [generate_mock_follower(start + i, username, draws, rng)
+            for i, (username, draws) in enumerate(rows)]
+
+
+def _iter_mock_followers(count: int, rng=random):
+    """
+    Yield count mock followers, generating large runs in worker processes
+    
+    Both paths generate the same seeded chunks and yield them in order, so the
+    output depends only on rng, not on the number of CPUs.
+    """
+    progress = _Progress(f"{CYAN} Extracted {{}} followers so far...")
+    tasks = _chunk_tasks(count, rng)
+    workers = os.cpu_count() or 1
+    done = 0
+    if count > _PARALLEL_MIN_ITEMS and workers > 1:
+        # A few chunks per worker are submitted at a time: imap would otherwise
+        # queue every task and buffer finished chunks faster than they are written
+        window = workers * 2
+        with multiprocessing.Pool(workers) as pool:
+            for first in range(0, len(tasks), window):
+                for chunk in pool.imap(_gen_follower_chunk, tasks[first:first + window]):
+                    yield from chunk
+                    done += len(chunk)
+                    progress.update(done)
+    else:
+        for task in tasks:
+            chunk = _gen_follower_chunk(task)
+            yield from chunk
+            done += len(chunk)
+            progress.update(done)
+
+
+def _iter_mock_videos(count: int, usernames, rng=random, progress: _Progress = None, desc_prefix: str = "",
+                      now_ts: int = None):
+    """
+    Yield count mock videos
+    
+    Args:
+        count: Number of videos
+        usernames: Author username per video (an iterable of at least count names)
+        rng: Random generator (random.Random or the random module)
+        progress: Progress reporter (default: "Extracted N videos so far...")
+        desc_prefix: Text prepended to every description (e.g. a hashtag)
+        now_ts: Current Unix time (default: now)
+    """
+    if progress is None:
+        progress = _Progress(f"{CYAN} Extracted {{}} videos so far...")
+    if now_ts is None:
+        now_ts = int(datetime.now().timestamp())
+    # Random stats are drawn one column at a time, a chunk of videos at a time.
+    # One author dict per distinct username, shared by all of its videos (never mutated)
+    authors = {}
+    for i, (username, draws) in enumerate(zip(usernames, _chunked_rows(_VIDEO_RANGES, count, rng))):
+        author = authors.get(username)
+        if author is None:
+            author = authors[username] = {"uniqueId": username, "nickname": username.capitalize() + " User"}
+        video = generate_mock_video(i, username, now_ts, draws, author=author)
+        if desc_prefix:
+            video['desc'] = desc_prefix + video['desc']
+        yield video
+        progress.update(i + 1)
+
+
+def mock_scrape_user(username: str, output_format: str = 'json', output_file: str = None, limit: int = None,
+                     include_followers: bool = False, follower_limit: int = None, quiet: bool = False,
+                     pretty: bool = False):
     """
     Mock scrape user profile, optionally videos, and optionally followers (generates fake data)
     
     Args:
         username: TikTok username to mock scrape
-        output_format: Output format ('json' or 'csv')
+        output_format: Output format ('json', 'jsonl' or 'csv')
         output_file: Output file path (optional)
         limit: Maximum number of videos to generate (only if followers not requested)
         include_followers: Whether to include follower list (if True, videos are skipped)
         follower_limit: Maximum number of followers to generate
         quiet: Suppress mock warnings (makes output look more realistic)
+        pretty: Indent JSON output (compact by default)
     """
     try:
+        # One clock read per run: timestamps, extracted_at and the file name agree
+        started = datetime.now()
+        extracted_at = started.isoformat()
         prefix = "" if quiet else f"{CYAN} [MOCK MODE] "
-        print(f"{prefix}Generating mock data for user: @{username}..." if not quiet else f"{CYAN} Loading user profile: @{username}...")
+        print(f"{prefix}Generating mock data for user: @{username}..." if not quiet
+              else f"{CYAN} Loading user profile: @{username}...")
+        
+        # Same username, same mock data
+        rng = _seeded_rng(username)
         
         # Generate mock user data
-        user_data = generate_mock_user_data(username)
+        user_data = generate_mock_user_data(username, rng)
         print(f"{GREEN} Profile loaded: {user_data['nickname']} (@{user_data['uniqueId']})")
         print(f"{CYAN} Followers: {user_data['followerCount']:,}")
         print(f"{CYAN} Following: {user_data['followingCount']:,}")
         print(f"{CYAN} Videos: {user_data['videoCount']:,}")
         
-        videos = []
-        followers = []
-        
         # If followers are requested, only extract followers (skip videos)
         if include_followers:
-            follower_count = follower_limit if follower_limit else min(user_data['followerCount'], 100)  # Limit to 100 or specified limit
+            # Limit to 100 or specified limit
+            follower_count = follower_limit if follower_limit else min(user_data['followerCount'], 100)
             print(f"{CYAN} Extracting followers...")
-            
-            for i in range(follower_count):
-                follower = generate_mock_follower(i)
-                followers.append(follower)
-                
-                if (i + 1) % 10 == 0:
-                    print(f"{CYAN} Extracted {i + 1} followers so far...")
+            items = _iter_mock_followers(follower_count, rng)
         else:
             # Generate mock videos only if followers are not requested
             video_count = limit if limit else min(user_data['videoCount'], 50)  # Limit to 50 or specified limit
             print(f"{CYAN} Extracting videos...")
+            items = _iter_mock_videos(video_count, itertools.repeat(username), rng, now_ts=int(started.timestamp()))
+        
+        # Output path is needed up front when streaming
+        if not output_file:
+            suffix = "_mock" if not quiet else ""
+            output_file = f"tiktok_user_{username}{suffix}_{started.strftime('%Y%m%d_%H%M%S')}.{output_format}"
+        
+        if output_format == 'jsonl':
+            # Profile on the first line, then each follower/video as it is generated
+            header = {"user": user_data, "extracted_at": extracted_at}
+            if not quiet:
+                header["mock_mode"] = True
+                header["note"] = "This is mock/test data generated for testing purposes"
+            total = _write_jsonl(output_file, header, items)
             
-            for i in range(video_count):
-                video = generate_mock_video(i, username)
-                videos.append(video)
-                
-                if (i + 1) % 10 == 0:
-                    print(f"{CYAN} Extracted {i + 1} videos so far...")
+            print(f"{GREEN} Data saved to: {output_file}")
+            print(f"{GREEN} Total {'followers' if include_followers else 'videos'} extracted: {total}")
+            if not quiet:
+                print(f"{YELLOW} Note: This is test/mock data, not real TikTok data")
+            return
         
         # Simulate some delay to make it feel realistic
         time.sleep(0.1)
         
-        # Prepare output data
-        output_data = {
-            "user": user_data,
-            "extracted_at": datetime.now().isoformat(),
-        }
-        
-        if include_followers:
-            output_data["followers"] = followers
-            output_data["total_followers"] = len(followers)
-        else:
-            output_data["videos"] = videos
-            output_data["total_videos"] = len(videos)
-        
-        if not quiet:
-            output_data["mock_mode"] = True
-            output_data["note"] = "This is mock/test data generated for testing purposes"
-        
         # Save output
-        if not output_file:
-            suffix = "_mock" if not quiet else ""
-            output_file = f"tiktok_user_{username}{suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
-        
         if output_format == 'json':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-        else:  # CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            # Prepare output data
+            output_data = {
+                "user": user_data,
+                "extracted_at": extracted_at,
+            }
+            
+            if include_followers:
+                output_data["followers"] = followers = list(items)
+                output_data["total_followers"] = len(followers)
+            else:
+                output_data["videos"] = videos = list(items)
+                output_data["total_videos"] = len(videos)
+            
+            if not quiet:
+                output_data["mock_mode"] = True
+                output_data["note"] = "This is mock/test data generated for testing purposes"
+            
+            _dump_json(output_data, output_file, pretty)
+        else:  # CSV: rows are written as they are generated, no list is kept
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 # Write user info as header
                 writer.writerow(['Type', 'Field', 'Value'])
@@ -201,204 +526,184 @@ def mock_scrape_user(username: str, output_format: str = 'json', output_file: st
                 writer.writerow([])  # Empty row
                 
                 # Write followers if included (instead of videos)
-                if include_followers and followers:
-                    writer.writerow(['Follower ID', 'Username', 'Nickname', 'Followers', 'Following', 'Videos', 'Verified'])
-                    for follower in followers:
-                        writer.writerow([
-                            follower.get('id', ''),
-                            follower.get('uniqueId', ''),
-                            follower.get('nickname', ''),
-                            follower.get('followerCount', ''),
-                            follower.get('followingCount', ''),
-                            follower.get('videoCount', ''),
-                            follower.get('verified', False)
-                        ])
+                if include_followers:
+                    writer.writerow(
+                        ['Follower ID', 'Username', 'Nickname', 'Followers', 'Following', 'Videos', 'Verified']
+                    )
+                    writer.writerows(map(_FOLLOWER_CSV_FIELDS, items))
                 else:
                     # Write videos only if followers are not requested
                     writer.writerow(['Video ID', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                    for video in videos:
-                        writer.writerow([
-                            video.get('id', ''),
-                            video.get('desc', '')[:100],  # Truncate description
-                            video.get('stats', {}).get('diggCount', ''),
-                            video.get('stats', {}).get('shareCount', ''),
-                            video.get('stats', {}).get('commentCount', ''),
-                            video.get('stats', {}).get('playCount', ''),
-                            video.get('createTime', '')
-                        ])
+                    writer.writerows([
+                        video['id'],
+                        video['desc'][:100],  # Truncate description
+                        *_STATS_CSV_FIELDS(video['stats']),
+                        video['createTime']
+                    ] for video in items)
         
         print(f"{GREEN} Data saved to: {output_file}")
         if include_followers:
-            print(f"{GREEN} Total followers extracted: {len(followers)}")
+            print(f"{GREEN} Total followers extracted: {follower_count}")
         else:
-            print(f"{GREEN} Total videos extracted: {len(videos)}")
+            print(f"{GREEN} Total videos extracted: {video_count}")
         if not quiet:
             print(f"{YELLOW} Note: This is test/mock data, not real TikTok data")
         
     except Exception as e:
         print(f"{RED} [MOCK] Error generating mock data: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
 
-def mock_scrape_trending(output_format: str = 'json', output_file: str = None, limit: int = None):
+def mock_scrape_trending(output_format: str = 'json', output_file: str = None, limit: int = None, pretty: bool = False):
     """
     Mock scrape trending videos (generates fake data)
     """
     try:
         print(f"{CYAN} [MOCK MODE] Generating mock trending videos...")
+        started = datetime.now()
         
         video_count = limit if limit else 30
         print(f"{CYAN} [MOCK] Generating {video_count} mock trending videos...")
+        progress = _Progress(f"{CYAN} [MOCK] Generated {{}}/{video_count} videos...")
         
-        videos = []
         trending_users = ['user1', 'creator2', 'tiktoker3', 'viral4', 'famous5']
-        
-        for i in range(video_count):
-            username = random.choice(trending_users)
-            video = generate_mock_video(i, username)
-            videos.append(video)
-            
-            if (i + 1) % 10 == 0:
-                print(f"{CYAN} [MOCK] Generated {i + 1}/{video_count} videos...")
+        usernames = _chunked_choices(trending_users, video_count, random)
+        # Generated lazily: CSV and JSONL write each video as it is produced
+        videos = _iter_mock_videos(video_count, usernames, random, progress, now_ts=int(started.timestamp()))
         
         time.sleep(0.1)
         
-        output_data = {
-            "videos": videos,
-            "extracted_at": datetime.now().isoformat(),
-            "total_videos": len(videos),
+        meta = {
+            "extracted_at": started.isoformat(),
+            "total_videos": video_count,
             "mock_mode": True,
             "note": "This is mock/test data generated for testing purposes"
         }
         
         if not output_file:
-            output_file = f"tiktok_trending_mock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+            output_file = f"tiktok_trending_mock_{started.strftime('%Y%m%d_%H%M%S')}.{output_format}"
         
         if output_format == 'json':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            _dump_json({"videos": list(videos), **meta}, output_file, pretty)
+        elif output_format == 'jsonl':
+            _write_jsonl(output_file, meta, videos)
         else:  # CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
-                writer.writerow(['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                for video in videos:
-                    writer.writerow([
-                        video.get('id', ''),
-                        video.get('author', {}).get('uniqueId', ''),
-                        video.get('desc', '')[:100],
-                        video.get('stats', {}).get('diggCount', ''),
-                        video.get('stats', {}).get('shareCount', ''),
-                        video.get('stats', {}).get('commentCount', ''),
-                        video.get('stats', {}).get('playCount', ''),
-                        video.get('createTime', '')
-                    ])
+                writer.writerow(
+                    ['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created']
+                )
+                writer.writerows([
+                    video['id'],
+                    video['author']['uniqueId'],
+                    video['desc'][:100],
+                    *_STATS_CSV_FIELDS(video['stats']),
+                    video['createTime']
+                ] for video in videos)
         
         print(f"{GREEN} [MOCK] Mock data saved to: {output_file}")
-        print(f"{GREEN} [MOCK] Total videos generated: {len(videos)}")
+        print(f"{GREEN} [MOCK] Total videos generated: {video_count}")
         print(f"{YELLOW} [MOCK] Note: This is test/mock data, not real TikTok data")
         
     except Exception as e:
         print(f"{RED} [MOCK] Error generating mock data: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
 
-def mock_scrape_hashtag(hashtag: str, output_format: str = 'json', output_file: str = None, limit: int = None):
+def mock_scrape_hashtag(hashtag: str, output_format: str = 'json', output_file: str = None, limit: int = None,
+                        pretty: bool = False):
     """
     Mock scrape hashtag videos (generates fake data)
     """
     try:
         print(f"{CYAN} [MOCK MODE] Generating mock videos for hashtag: #{hashtag}...")
+        started = datetime.now()
         
         video_count = limit if limit else 30
         print(f"{CYAN} [MOCK] Generating {video_count} mock videos...")
+        progress = _Progress(f"{CYAN} [MOCK] Generated {{}}/{video_count} videos...")
         
-        videos = []
         hashtag_users = [f'user{i}' for i in range(1, 10)]
-        
-        for i in range(video_count):
-            username = random.choice(hashtag_users)
-            video = generate_mock_video(i, username)
-            # Add hashtag to description
-            video['desc'] = f"#{hashtag} {video['desc']}"
-            videos.append(video)
-            
-            if (i + 1) % 10 == 0:
-                print(f"{CYAN} [MOCK] Generated {i + 1}/{video_count} videos...")
+        rng = _seeded_rng(hashtag)
+        usernames = _chunked_choices(hashtag_users, video_count, rng)
+        # Generated lazily: CSV and JSONL write each video as it is produced.
+        # The hashtag is added to each description
+        videos = _iter_mock_videos(video_count, usernames, rng, progress, desc_prefix=f"#{hashtag} ",
+                                   now_ts=int(started.timestamp()))
         
         time.sleep(0.1)
         
-        output_data = {
-            "hashtag": hashtag,
-            "videos": videos,
-            "extracted_at": datetime.now().isoformat(),
-            "total_videos": len(videos),
+        meta = {
+            "extracted_at": started.isoformat(),
+            "total_videos": video_count,
             "mock_mode": True,
             "note": "This is mock/test data generated for testing purposes"
         }
         
         if not output_file:
-            output_file = f"tiktok_hashtag_{hashtag}_mock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+            output_file = f"tiktok_hashtag_{hashtag}_mock_{started.strftime('%Y%m%d_%H%M%S')}.{output_format}"
         
         if output_format == 'json':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            _dump_json({"hashtag": hashtag, "videos": list(videos), **meta}, output_file, pretty)
+        elif output_format == 'jsonl':
+            _write_jsonl(output_file, {"hashtag": hashtag, **meta}, videos)
         else:  # CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
-                writer.writerow(['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created'])
-                for video in videos:
-                    writer.writerow([
-                        video.get('id', ''),
-                        video.get('author', {}).get('uniqueId', ''),
-                        video.get('desc', '')[:100],
-                        video.get('stats', {}).get('diggCount', ''),
-                        video.get('stats', {}).get('shareCount', ''),
-                        video.get('stats', {}).get('commentCount', ''),
-                        video.get('stats', {}).get('playCount', ''),
-                        video.get('createTime', '')
-                    ])
+                writer.writerow(
+                    ['Video ID', 'Author', 'Description', 'Likes', 'Shares', 'Comments', 'Views', 'Created']
+                )
+                writer.writerows([
+                    video['id'],
+                    video['author']['uniqueId'],
+                    video['desc'][:100],
+                    *_STATS_CSV_FIELDS(video['stats']),
+                    video['createTime']
+                ] for video in videos)
         
         print(f"{GREEN} [MOCK] Mock data saved to: {output_file}")
-        print(f"{GREEN} [MOCK] Total videos generated: {len(videos)}")
+        print(f"{GREEN} [MOCK] Total videos generated: {video_count}")
         print(f"{YELLOW} [MOCK] Note: This is test/mock data, not real TikTok data")
         
     except Exception as e:
         print(f"{RED} [MOCK] Error generating mock data: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
 
-def mock_scrape_video(video_id: str, output_format: str = 'json', output_file: str = None, include_comments: bool = False, comment_limit: int = 30):
+def mock_scrape_video(video_id: str, output_format: str = 'json', output_file: str = None,
+                      include_comments: bool = False, comment_limit: int = 30, pretty: bool = False):
     """
     Mock scrape video details (generates fake data)
     """
     try:
         print(f"{CYAN} [MOCK MODE] Generating mock video data for: {video_id}...")
         
+        started = datetime.now()
+        now_ts = int(started.timestamp())
+        rng = _seeded_rng(video_id)
+        
         # Generate mock video info
         video_info = {
             "id": video_id,
             "desc": f"Mock video description for {video_id}",
-            "createTime": int(datetime.now().timestamp()) - random.randint(0, 86400 * 30),
+            "createTime": now_ts - rng.randint(0, 86400 * 30),
             "author": {
                 "uniqueId": "mockuser",
                 "nickname": "Mock User",
             },
             "stats": {
-                "diggCount": random.randint(1000, 5000000),
-                "shareCount": random.randint(100, 500000),
-                "commentCount": random.randint(50, 100000),
-                "playCount": random.randint(10000, 10000000),
+                "diggCount": rng.randint(1000, 5000000),
+                "shareCount": rng.randint(100, 500000),
+                "commentCount": rng.randint(50, 100000),
+                "playCount": rng.randint(10000, 10000000),
             },
             "video": {
                 "downloadAddr": f"https://example.com/videos/{video_id}.mp4",
                 "cover": f"https://example.com/covers/{video_id}.jpg",
-                "duration": random.randint(10, 60),
+                "duration": rng.randint(10, 60),
             },
         }
         
@@ -409,17 +714,17 @@ def mock_scrape_video(video_id: str, output_format: str = 'json', output_file: s
         comments = []
         if include_comments:
             print(f"{CYAN} [MOCK] Generating {comment_limit} mock comments...")
-            for i in range(comment_limit):
-                comments.append(generate_mock_comment(i))
-                if (i + 1) % 10 == 0:
-                    print(f"{CYAN} [MOCK] Generated {i + 1}/{comment_limit} comments...")
+            progress = _Progress(f"{CYAN} [MOCK] Generated {{}}/{comment_limit} comments...")
+            for i, draws in enumerate(_rand_rows(_COMMENT_RANGES, comment_limit, rng)):
+                comments.append(generate_mock_comment(i, now_ts, draws))
+                progress.update(i + 1)
             print(f"{GREEN} [MOCK] Total comments generated: {len(comments)}")
         
         time.sleep(0.1)
         
         output_data = {
             "video": video_info,
-            "extracted_at": datetime.now().isoformat(),
+            "extracted_at": started.isoformat(),
             "mock_mode": True,
             "note": "This is mock/test data generated for testing purposes"
         }
@@ -429,13 +734,16 @@ def mock_scrape_video(video_id: str, output_format: str = 'json', output_file: s
             output_data["total_comments"] = len(comments)
         
         if not output_file:
-            output_file = f"tiktok_video_{video_id}_mock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output_format}"
+            output_file = f"tiktok_video_{video_id}_mock_{started.strftime('%Y%m%d_%H%M%S')}.{output_format}"
         
         if output_format == 'json':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            _dump_json(output_data, output_file, pretty)
+        elif output_format == 'jsonl':
+            # Video info on the first line, then one comment per line
+            header = {key: value for key, value in output_data.items() if key != "comments"}
+            _write_jsonl(output_file, header, comments if include_comments else None)
         else:  # CSV
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            with open(output_file, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(['Type', 'Field', 'Value'])
                 writer.writerow(['Video', 'id', video_info.get('id', '')])
@@ -448,21 +756,19 @@ def mock_scrape_video(video_id: str, output_format: str = 'json', output_file: s
                 if include_comments and comments:
                     writer.writerow([])
                     writer.writerow(['Comment ID', 'Author', 'Text', 'Likes', 'Created'])
-                    for comment in comments:
-                        writer.writerow([
-                            comment.get('id', ''),
-                            comment.get('user', {}).get('uniqueId', ''),
-                            comment.get('text', '')[:100],
-                            comment.get('diggCount', ''),
-                            comment.get('createTime', '')
-                        ])
+                    writer.writerows([
+                        comment['id'],
+                        comment['user']['uniqueId'],
+                        comment['text'][:100],
+                        comment['diggCount'],
+                        comment['createTime']
+                    ] for comment in comments)
         
         print(f"{GREEN} [MOCK] Mock data saved to: {output_file}")
         print(f"{YELLOW} [MOCK] Note: This is test/mock data, not real TikTok data")
         
     except Exception as e:
         print(f"{RED} [MOCK] Error generating mock data: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -472,17 +778,26 @@ def main():
     parser.add_argument('-m', '--mode', choices=['user', 'trending', 'hashtag', 'video'], required=True,
                         help='Scraping mode: user, trending, hashtag, or video')
     parser.add_argument('-t', '--target', required=False,
-                        help='Target: username (for user), hashtag name (for hashtag), or video ID/URL (for video). Ignored for trending.')
-    parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json',
-                        help='Output format (default: json)')
+                        help='Target: username (for user), hashtag name (for hashtag), or video ID/URL (for video). '
+                             'Ignored for trending.')
+    parser.add_argument('-f', '--format', choices=['json', 'jsonl', 'csv'], default='json',
+                        help='Output format (default: json). jsonl streams one record per line as it is generated')
+    parser.add_argument('--ndjson', action='store_const', const='jsonl', dest='format',
+                        help='Same as --format jsonl')
     parser.add_argument('-o', '--output', help='Output file path (optional, auto-generated if not provided)')
     parser.add_argument('-l', '--limit', type=int, help='Maximum number of items to generate (videos/comments)')
-    parser.add_argument('--comments', action='store_true', help='Include comments when scraping video (video mode only)')
-    parser.add_argument('--comment-limit', type=int, default=30, help='Maximum number of comments to generate (default: 30)')
+    parser.add_argument('--comments', action='store_true',
+                        help='Include comments when scraping video (video mode only)')
+    parser.add_argument('--comment-limit', type=int, default=30,
+                        help='Maximum number of comments to generate (default: 30)')
     parser.add_argument('--session', help='Ignored in mock mode (kept for compatibility)')
-    parser.add_argument('--followers', action='store_true', help='Include follower list when scraping users (user mode only)')
+    parser.add_argument('--followers', action='store_true',
+                        help='Include follower list when scraping users (user mode only)')
     parser.add_argument('--follower-limit', type=int, help='Maximum number of followers to extract (default: 100)')
-    parser.add_argument('--quiet', '-q', action='store_true', help='Suppress mock warnings (makes output look more realistic)')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Suppress mock warnings (makes output look more realistic)')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent JSON output (default: compact, which is faster and smaller)')
     
     args = parser.parse_args()
     
@@ -503,15 +818,16 @@ def main():
             args.limit,
             include_followers=args.followers,
             follower_limit=args.follower_limit,
-            quiet=quiet
+            quiet=quiet,
+            pretty=args.pretty
         )
     elif args.mode == 'trending':
-        mock_scrape_trending(args.format, args.output, args.limit)
+        mock_scrape_trending(args.format, args.output, args.limit, pretty=args.pretty)
     elif args.mode == 'hashtag':
         if not args.target:
             print(f"{RED} Error: --target is required for hashtag mode")
             sys.exit(1)
-        mock_scrape_hashtag(args.target, args.format, args.output, args.limit)
+        mock_scrape_hashtag(args.target, args.format, args.output, args.limit, pretty=args.pretty)
     elif args.mode == 'video':
         if not args.target:
             print(f"{RED} Error: --target is required for video mode")
@@ -523,7 +839,8 @@ def main():
             video_id = video_id.split('/')[-1] if '/' in video_id else video_id
             if not video_id or video_id == args.target:
                 video_id = str(random.randint(7000000000000000000, 7999999999999999999))
-        mock_scrape_video(video_id, args.format, args.output, args.comments, args.comment_limit if args.comments else None)
+        mock_scrape_video(video_id, args.format, args.output, args.comments,
+                          args.comment_limit if args.comments else None, pretty=args.pretty)
 
 
 if __name__ == '__main__':
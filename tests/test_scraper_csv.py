@@ -0,0 +1,117 @@
+import csv
+import importlib.util
+import io
+import os
+import pytest
+
+# Scraper/ is a folder of scripts, not a package: load the module from its path
+_SCRAPER_PATH = os.path.join(os.path.dirname(__file__), "..", "Scraper", "tiktok_scraper.py")
+_spec = importlib.util.spec_from_file_location("tiktok_scraper", _SCRAPER_PATH)
+tiktok_scraper = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tiktok_scraper)
+
+# Values csv.writer has to quote, escape or blank out
+tricky_values = [
+    "plain",
+    "",
+    "comma, inside",
+    'say "hi"',
+    "line\nbreak",
+    "carriage\rreturn",
+    "crlf\r\nend",
+    " leading space",
+    "désc ünïcode",
+    "1,000",
+    None,
+    0,
+    12345678901234567890,
+    -5,
+    1.5,
+    True,
+    [1, 2],
+]
+
+
+def csv_writer_output(rows):
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def async_iter(items):
+    for item in items:
+        yield item
+
+
+def test_csv_field_matches_csv_writer():
+    for value in tricky_values:
+        expected = csv_writer_output([["x", value]]).decode("utf-8")
+        assert "x," + tiktok_scraper._csv_field(value) + "\r\n" == expected, repr(value)
+
+
+def test_csv_rows_match_csv_writer():
+    rows = [
+        ["Type", "Field", "Value"],
+        ["User", "nickname", 'a "quoted", multi\nline name'],
+        ["User", "followers", None],
+        [],
+        tricky_values,
+    ]
+    assert tiktok_scraper._csv_rows(rows) == csv_writer_output(rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("with_author", [True, False])
+async def test_write_video_rows_match_csv_writer(with_author):
+    videos = [
+        {
+            "id": "7000",
+            "desc": 'desc, with "quotes"\nand a newline',
+            "createTime": 1700000000,
+            "author": {"uniqueId": "user,name"},
+            "stats": {"diggCount": 1, "shareCount": 2, "commentCount": 3, "playCount": 4},
+        },
+        {
+            "id": "7001",
+            "desc": "x" * 250,
+            "createTime": None,
+            "author": None,
+            "stats": {"diggCount": None, "shareCount": "1,000", "commentCount": '"5"', "playCount": 0},
+        },
+        {"id": 7002},
+    ]
+
+    expected_rows = []
+    for video in videos:
+        stats = video.get("stats") or {}
+        row = [video.get("id", "")]
+        if with_author:
+            row.append((video.get("author") or {}).get("uniqueId", ""))
+        row += [
+            video.get("desc", "")[:100],
+            stats.get("diggCount", ""),
+            stats.get("shareCount", ""),
+            stats.get("commentCount", ""),
+            stats.get("playCount", ""),
+            video.get("createTime", ""),
+        ]
+        expected_rows.append(row)
+
+    output = io.BytesIO()
+    count = await tiktok_scraper._write_video_rows(output, async_iter(videos), with_author)
+
+    assert count == len(videos)
+    assert output.getvalue() == csv_writer_output(expected_rows)
+
+
+@pytest.mark.asyncio
+async def test_write_video_rows_batches(monkeypatch):
+    monkeypatch.setattr(tiktok_scraper, "_CSV_BATCH_SIZE", 2)
+    videos = [{"id": str(i), "desc": "d", "stats": {"diggCount": i}} for i in range(5)]
+
+    output = io.BytesIO()
+    count = await tiktok_scraper._write_video_rows(output, async_iter(videos), with_author=False)
+
+    expected_rows = [[str(i), "d", i, "", "", "", ""] for i in range(5)]
+    assert count == 5
+    assert output.getvalue() == csv_writer_output(expected_rows)